@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Sequence
+from typing import TYPE_CHECKING, Any, Sequence, cast
 
 from admin_extra_buttons.decorators import button
 from admin_extra_buttons.mixins import ExtraButtonsMixin, confirm_action
@@ -14,12 +14,31 @@ from django.urls import reverse
 
 from django_celery_boost.models import CeleryTaskModel
 
+if TYPE_CHECKING:
+    from django.contrib.admin.views.main import ChangeList
+
 
 class CeleryTaskModelAdmin(ExtraButtonsMixin, admin.ModelAdmin):
     change_form_template = "admin/celery_boost/change_form.html"
     terminate_template = None
     inspect_template = None
     queue_template = None
+    status_cache_ttl: float = 5
+    "Seconds task status and info are memoized on objects rendered by a single request"
+    status_columns: Sequence[str] = ("task_status",)
+    "`list_display` columns reading `task_status`, prefetched for the whole changelist page"
+    position_columns: Sequence[str] = ("queue_position",)
+    "`list_display` columns reading `queue_position`, prefetched for the whole changelist page"
+    tracking_columns: Sequence[str] = (
+        "progress_info",
+        "progress_stats_info",
+        "progress",
+        "tracking_info",
+        "progress_rate",
+        "progress_elapsed",
+        "progress_eta",
+    )
+    "`list_display` columns reading the tracking data, prefetched for the whole changelist page"
 
     def get_readonly_fields(self, request: HttpRequest, obj: Model | None = None) -> Sequence[str]:
         ret = list(super().get_readonly_fields(request, obj))
@@ -29,6 +48,25 @@ class CeleryTaskModelAdmin(ExtraButtonsMixin, admin.ModelAdmin):
     def check(self, **kwargs):
         return []
 
+    def get_object(self, request: HttpRequest, object_id: str, from_field: str | None = None):
+        obj = cast("CeleryTaskModel | None", super().get_object(request, object_id, from_field))
+        if obj is not None:
+            obj.celery_status_cache_ttl = max(obj.celery_status_cache_ttl, self.status_cache_ttl)
+        return obj
+
+    def get_changelist_instance(self, request: HttpRequest) -> "ChangeList":
+        cl = super().get_changelist_instance(request)
+        # one round-trip for the whole page instead of a few per row and column, only for the displayed data
+        columns = set(cl.list_display)
+        prefetch = {
+            "status": not columns.isdisjoint(self.status_columns),
+            "position": not columns.isdisjoint(self.position_columns),
+            "tracking": not columns.isdisjoint(self.tracking_columns),
+        }
+        if any(prefetch.values()):
+            cast("type[CeleryTaskModel]", self.model).prefetch_live_info(cl.result_list, **prefetch)
+        return cl
+
     @button()
     def check_status(self, request: HttpRequest) -> "HttpResponse":  # type: ignore
         obj: CeleryTaskModel
@@ -253,3 +291,22 @@ class CeleryTaskModelAdmin(ExtraButtonsMixin, admin.ModelAdmin):
         return obj.progress or "-"
 
     progress_info.short_description = "Progress"
+
+    def progress_stats_info(self, obj: CeleryTaskModel) -> str:
+        """Display rate, elapsed time and ETA for use in list_display.
+
+        Args:
+            obj: The CeleryTaskModel instance
+
+        Returns:
+            'rate/s, elapsed, ETA' or '-' if not available.
+        """
+        stats = obj.get_progress_stats()
+        if not stats or stats.elapsed is None:
+            return "-"
+        ret = [f"{stats.rate:.4g}/s" if stats.rate is not None else "-/s", str(stats.elapsed).split(".")[0]]
+        if stats.eta is not None:
+            ret.append(f"ETA {str(stats.eta).split('.')[0]}")
+        return ", ".join(ret)
+
+    progress_stats_info.short_description = "Rate / Elapsed / ETA"  # type: ignore[attr-defined]
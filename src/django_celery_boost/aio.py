@@ -0,0 +1,175 @@
+"""asyncio counterparts of the Redis helpers used by `CeleryTaskModel`.
+
+Clients are built on `redis.asyncio` and share one connection pool per Redis URL and event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import weakref
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable
+
+from asgiref.sync import sync_to_async
+from celery import states
+from celery.backends.base import BaseKeyValueStoreBackend
+from celery.result import AsyncResult
+from redis import asyncio as aioredis
+
+from django_celery_boost import broker
+
+if TYPE_CHECKING:
+    from celery.app.base import Celery
+
+logger = logging.getLogger(__name__)
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, aioredis.ConnectionPool]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+_hubs: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, TrackingHub]" = weakref.WeakKeyDictionary()
+
+
+def get_client(url: str) -> aioredis.Redis:
+    """Return a client of the pool shared by the running event loop for `url`."""
+    pools = _pools.setdefault(asyncio.get_running_loop(), {})
+    if url not in pools:
+        pools[url] = aioredis.ConnectionPool.from_url(url)
+    return aioredis.Redis(connection_pool=pools[url])
+
+
+def get_broker_client(app: "Celery") -> aioredis.Redis:
+    """Return a client connected to the Celery broker."""
+    return get_client(app.connection_for_read().as_uri(include_password=True))
+
+
+async def get_task_state(app: "Celery", task_id: str) -> str:
+    """Return the Celery state of a task, reading the result backend without blocking."""
+    backend = app.backend
+    url = getattr(backend, "url", None)
+    if not (isinstance(backend, BaseKeyValueStoreBackend) and url and url.startswith(("redis://", "rediss://"))):
+        return await sync_to_async(lambda: AsyncResult(task_id, app=app).state)()
+    meta = await get_client(url).get(backend.get_key_for_task(task_id))
+    if meta is None:
+        return states.PENDING
+    return backend.decode_result(meta)["status"]
+
+
+async def task_position(client: aioredis.Redis, queue: str, task_id: str) -> int:
+    """Return the position of `task_id` in `queue`, as `CeleryTaskModel.get_task_position()` does.
+
+    Returns:
+        1-based position (1 is the next task to be consumed) or 0 if the task is not queued.
+
+    """
+    task_id = str(task_id)
+    if broker.CELERY_BOOST_QUEUE_INDEX:
+        key = broker.get_index_key(queue)
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.zrank(key, task_id)
+            pipe.zcard(key)
+            pipe.llen(queue)
+            rank, indexed, size = await pipe.execute()
+        if indexed == size:
+            return 0 if rank is None else rank + 1
+    if broker.CELERY_BOOST_QUEUE_SCRIPTS:
+        script = client.register_script(broker.QUEUE_POSITION_SCRIPT)
+        return int(await script(keys=[queue], args=[task_id, broker.CELERY_BOOST_QUEUE_SCAN_WINDOW]))
+    window = broker.CELERY_BOOST_QUEUE_SCAN_WINDOW
+    offset = 0
+    while True:
+        chunk = await client.lrange(queue, -offset - window, -offset - 1)
+        for i, message in enumerate(reversed(chunk)):
+            if broker.decode_headers(message).get("id") == task_id:
+                return offset + i + 1
+        if len(chunk) < window:
+            return 0
+        offset += window
+
+
+async def remove_task(client: aioredis.Redis, queue: str, revoked_queue: str, task_id: str) -> None:
+    """Remove a task from `queue` and flag it as revoked, as `CeleryTaskModel.terminate()` does."""
+    task_id = str(task_id)
+    if broker.CELERY_BOOST_QUEUE_SCRIPTS:
+        script = client.register_script(broker.QUEUE_REMOVE_SCRIPT)
+        await script(
+            keys=[queue, revoked_queue, broker.get_index_key(queue)],
+            args=[task_id, broker.CELERY_BOOST_QUEUE_SCAN_WINDOW],
+        )
+        return
+    await client.sadd(revoked_queue, task_id)
+    window = broker.CELERY_BOOST_QUEUE_SCAN_WINDOW
+    offset = 0
+    while True:
+        chunk = await client.lrange(queue, offset, offset + window - 1)
+        message: Any = next((m for m in chunk if broker.decode_headers(m).get("id") == task_id), None)
+        if message is not None:
+            await client.lrem(queue, 1, message)
+            break
+        if len(chunk) < window:
+            break
+        offset += window
+    if broker.CELERY_BOOST_QUEUE_INDEX:
+        await client.zrem(broker.get_index_key(queue), task_id)
+
+
+class TrackingHub:
+    """Share one Redis subscription to tracking channels between all the listeners of an event loop.
+
+    Each listener receives `(task_id, data)` tuples of the tracking fields changed by
+    `set_tracking_info()` and the other writers (see `CELERY_BOOST_TRACKING_PUBLISH`).
+    """
+
+    def __init__(self, client: aioredis.Redis):
+        self.pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self.listeners: dict[str, set[asyncio.Queue[tuple[str, dict[str, str]]]]] = {}
+        self._reader: asyncio.Task[None] | None = None
+
+    @asynccontextmanager
+    async def listen(self, task_ids: Iterable[str]) -> AsyncIterator[asyncio.Queue[tuple[str, dict[str, str]]]]:
+        """Subscribe to the tracking changes of `task_ids`, returning the queue receiving them."""
+        queue: asyncio.Queue[tuple[str, dict[str, str]]] = asyncio.Queue()
+        task_ids = {str(task_id) for task_id in task_ids}
+        new = [task_id for task_id in task_ids if task_id not in self.listeners]
+        for task_id in task_ids:
+            self.listeners.setdefault(task_id, set()).add(queue)
+        try:
+            if new:
+                await self.pubsub.subscribe(*[broker.get_tracking_channel(task_id) for task_id in new])
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read())
+            yield queue
+        finally:
+            unused = []
+            for task_id in task_ids:
+                self.listeners[task_id].discard(queue)
+                if not self.listeners[task_id]:
+                    del self.listeners[task_id]
+                    unused.append(task_id)
+            if unused:
+                await self.pubsub.unsubscribe(*[broker.get_tracking_channel(task_id) for task_id in unused])
+
+    async def _read(self) -> None:
+        prefix = len(broker.get_tracking_channel(""))
+        while self.listeners:
+            try:
+                message = await self.pubsub.get_message(timeout=1.0)
+            except Exception as e:  # noqa
+                logger.exception(e)
+                await asyncio.sleep(1)
+                continue
+            if message and message["type"] == "message":
+                task_id = message["channel"].decode()[prefix:]
+                data = json.loads(message["data"])
+                for queue in self.listeners.get(task_id, ()):
+                    queue.put_nowait((task_id, data))
+
+
+def get_tracking_hub(app: "Celery") -> TrackingHub:
+    """Return the `TrackingHub` of the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _hubs:
+        _hubs[loop] = TrackingHub(get_broker_client(app))
+    return _hubs[loop]
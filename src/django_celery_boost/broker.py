@@ -0,0 +1,937 @@
+"""Helpers to inspect the Redis lists kombu uses as Celery queues."""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Generator, Iterable, NamedTuple
+
+from celery import current_app, signals
+from django.conf import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from redis import Redis
+
+logger = logging.getLogger(__name__)
+
+CELERY_BOOST_QUEUE_INDEX = getattr(settings, "CELERY_BOOST_QUEUE_INDEX", False)
+CELERY_BOOST_QUEUE_INDEX_REBUILD_INTERVAL = getattr(settings, "CELERY_BOOST_QUEUE_INDEX_REBUILD_INTERVAL", 300)
+CELERY_BOOST_QUEUE_INDEX_KEY_PREFIX = getattr(settings, "CELERY_BOOST_QUEUE_INDEX_KEY_PREFIX", "celery:queue:index")
+CELERY_BOOST_QUEUE_SCRIPTS = getattr(settings, "CELERY_BOOST_QUEUE_SCRIPTS", False)
+CELERY_BOOST_QUEUE_SCAN_WINDOW = getattr(settings, "CELERY_BOOST_QUEUE_SCAN_WINDOW", 1000)
+CELERY_BOOST_QUEUE_SNAPSHOT_MAX_AGE = getattr(settings, "CELERY_BOOST_QUEUE_SNAPSHOT_MAX_AGE", 0)
+CELERY_BOOST_QUEUE_SNAPSHOT_KEY_PREFIX = getattr(
+    settings, "CELERY_BOOST_QUEUE_SNAPSHOT_KEY_PREFIX", "celery:queue:snapshot"
+)
+CELERY_BOOST_GROUP_KEY_PREFIX = getattr(settings, "CELERY_BOOST_GROUP_KEY_PREFIX", "celery:group")
+CELERY_BOOST_COALESCE_KEY_PREFIX = getattr(settings, "CELERY_BOOST_COALESCE_KEY_PREFIX", "celery:coalesce")
+CELERY_BOOST_TRACKING_CHANNEL_PREFIX = getattr(
+    settings, "CELERY_BOOST_TRACKING_CHANNEL_PREFIX", "celery:task:tracking:channel"
+)
+
+# prefix of the tracking hash fields kept by the library, hidden from the tracking data
+TRACKING_INTERNAL_PREFIX = ":"
+# hash field of the snapshot holding its build time
+SNAPSHOT_BUILT_FIELD = ":built"
+# snapshots are never read after `max_age`, expiring them only reclaims memory
+SNAPSHOT_EXPIRE = 3600
+# milliseconds after which the lock of a crashed builder is released, also the time a stale
+# snapshot is still served while someone else rebuilds it
+SNAPSHOT_LOCK_TIMEOUT = 30000
+
+# Adds a task id to the queue index using an ever-increasing sequence as score
+INDEX_ADD_SCRIPT = """
+local seq = redis.call('INCR', KEYS[2])
+redis.call('ZADD', KEYS[1], seq, ARGV[1])
+return seq
+"""
+
+# Replaces the index KEYS[2] with the ids of the queue KEYS[1], read in LRANGE windows of ARGV[1]
+# entries from the head, atomically with publishes and consumers. Rebuilt entries get non-positive
+# scores, so they always rank before new tasks; a duplicated id keeps the newest entry.
+# Returns the positions of the ids in ARGV[2..] in the rebuilt index.
+REBUILD_INDEX_SCRIPT = """
+local size = redis.call('LLEN', KEYS[1])
+local window = tonumber(ARGV[1])
+redis.call('DEL', KEYS[2])
+local offset = 0
+while offset < size do
+    local chunk = redis.call('LRANGE', KEYS[1], offset, offset + window - 1)
+    local entries = {}
+    for i, message in ipairs(chunk) do
+        local task_id = string.match(message, '"id": "([^"]+)"')
+        if not task_id then
+            local ok, data = pcall(cjson.decode, message)
+            if ok and type(data['headers']) == 'table' then
+                task_id = data['headers']['id']
+            end
+        end
+        if task_id then
+            table.insert(entries, 1 - offset - i)
+            table.insert(entries, task_id)
+        end
+    end
+    if #entries > 0 then
+        redis.call('ZADD', KEYS[2], 'NX', unpack(entries))
+    end
+    offset = offset + window
+end
+local positions = {}
+for i = 2, #ARGV do
+    local rank = redis.call('ZRANK', KEYS[2], ARGV[i])
+    positions[i - 1] = rank and rank + 1 or 0
+end
+return positions
+"""
+
+# Walks the queue from the tail (next message to be consumed) in LRANGE windows,
+# decoding only the messages that contain the task id. Returns {position, message}.
+_FIND_FUNCTION = """
+local function find(queue, task_id, window)
+    local size = redis.call('LLEN', queue)
+    local offset = 0
+    while offset < size do
+        local chunk = redis.call('LRANGE', queue, -offset - window, -offset - 1)
+        for i = #chunk, 1, -1 do
+            local message = chunk[i]
+            if string.find(message, task_id, 1, true) then
+                local ok, data = pcall(cjson.decode, message)
+                if ok and type(data['headers']) == 'table' and data['headers']['id'] == task_id then
+                    return {offset + #chunk - i + 1, message}
+                end
+            end
+        end
+        offset = offset + window
+    end
+    return {0, false}
+end
+"""
+
+QUEUE_POSITION_SCRIPT = (
+    _FIND_FUNCTION
+    + """
+return find(KEYS[1], ARGV[1], tonumber(ARGV[2]))[1]
+"""
+)
+
+QUEUE_FIND_SCRIPT = (
+    _FIND_FUNCTION
+    + """
+return find(KEYS[1], ARGV[1], tonumber(ARGV[2]))
+"""
+)
+
+# Returns the ids in ARGV[2..] that are in the queue, stopping as soon as all of them are found.
+# The id is matched in the raw message and the message fully decoded only if that fails.
+QUEUE_FILTER_SCRIPT = """
+local wanted = {}
+local missing = #ARGV - 1
+for i = 2, #ARGV do
+    wanted[ARGV[i]] = true
+end
+local window = tonumber(ARGV[1])
+local found = {}
+local offset = 0
+while missing > 0 do
+    local chunk = redis.call('LRANGE', KEYS[1], offset, offset + window - 1)
+    for _, message in ipairs(chunk) do
+        local task_id = string.match(message, '"id": "([^"]+)"')
+        if not task_id then
+            local ok, data = pcall(cjson.decode, message)
+            if ok and type(data['headers']) == 'table' then
+                task_id = data['headers']['id']
+            end
+        end
+        if task_id and wanted[task_id] then
+            wanted[task_id] = nil
+            missing = missing - 1
+            table.insert(found, task_id)
+        end
+    end
+    if #chunk < window then
+        break
+    end
+    offset = offset + window
+end
+return found
+"""
+
+# Returns, for each queue in KEYS[3..] (with its index key in the following position):
+# size, messages flagged as revoked in KEYS[1] but still queued, messages reserved by workers
+# (kombu keeps them in the KEYS[2] hash until acked) and the id of the next message to be consumed.
+# Revoked ids are looked up in the queue index when it is enabled (ARGV[1]) and up to date,
+# iterating the smaller of the two sets. Otherwise the queue is scanned only if requested (ARGV[3]),
+# as the scan blocks Redis for O(queue length).
+QUEUE_STATS_SCRIPT = """
+local revoked = redis.call('SCARD', KEYS[1])
+local window = tonumber(ARGV[2])
+local reserved = {}
+for _, value in ipairs(redis.call('HVALS', KEYS[2])) do
+    local routing_key = string.match(value, '"([^"]*)"%]$')
+    if routing_key then
+        reserved[routing_key] = (reserved[routing_key] or 0) + 1
+    end
+end
+local ret = {revoked}
+for i = 3, #KEYS, 2 do
+    local queue = KEYS[i]
+    local index = KEYS[i + 1]
+    local size = redis.call('LLEN', queue)
+    local canceled = 0
+    if revoked > 0 and size > 0 then
+        if ARGV[1] == '1' and redis.call('ZCARD', index) == size then
+            if revoked <= size then
+                for _, task_id in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+                    if redis.call('ZSCORE', index, task_id) then
+                        canceled = canceled + 1
+                    end
+                end
+            else
+                for _, task_id in ipairs(redis.call('ZRANGE', index, 0, -1)) do
+                    canceled = canceled + redis.call('SISMEMBER', KEYS[1], task_id)
+                end
+            end
+        elseif ARGV[3] == '1' then
+            local offset = 0
+            while offset < size do
+                for _, message in ipairs(redis.call('LRANGE', queue, offset, offset + window - 1)) do
+                    local task_id = string.match(message, '"id": "([^"]+)"')
+                    if task_id and redis.call('SISMEMBER', KEYS[1], task_id) == 1 then
+                        canceled = canceled + 1
+                    end
+                end
+                offset = offset + window
+            end
+        end
+    end
+    local next_id = false
+    local message = redis.call('LINDEX', queue, -1)
+    if message then
+        next_id = string.match(message, '"id": "([^"]+)"') or false
+    end
+    table.insert(ret, size)
+    table.insert(ret, canceled)
+    table.insert(ret, reserved[queue] or 0)
+    table.insert(ret, next_id)
+end
+return ret
+"""
+
+# Atomically removes the message from the queue, flags the task as revoked and prunes the index
+QUEUE_REMOVE_SCRIPT = (
+    _FIND_FUNCTION
+    + """
+local found = find(KEYS[1], ARGV[1], tonumber(ARGV[2]))
+if found[1] > 0 then
+    redis.call('LREM', KEYS[1], 1, found[2])
+end
+redis.call('SADD', KEYS[2], ARGV[1])
+redis.call('ZREM', KEYS[3], ARGV[1])
+return found[1]
+"""
+)
+
+# Removes from the queue all the messages of the tasks in ARGV[3..], flags all of them as revoked
+# and prunes the index, scanning the queue once. Matching messages are replaced by the ARGV[2]
+# tombstone while scanning, so that positions do not shift, and removed with a single LREM.
+# Returns the ids of the removed messages.
+QUEUE_REMOVE_MANY_SCRIPT = """
+local window = tonumber(ARGV[1])
+local tombstone = ARGV[2]
+local wanted = {}
+for i = 3, #ARGV do
+    wanted[ARGV[i]] = true
+end
+for i = 3, #ARGV, 1000 do
+    local last = math.min(i + 999, #ARGV)
+    redis.call('SADD', KEYS[2], unpack(ARGV, i, last))
+    redis.call('ZREM', KEYS[3], unpack(ARGV, i, last))
+end
+local removed = {}
+local offset = 0
+while true do
+    local chunk = redis.call('LRANGE', KEYS[1], offset, offset + window - 1)
+    for i, message in ipairs(chunk) do
+        local task_id = string.match(message, '"id": "([^"]+)"')
+        if not task_id then
+            local ok, data = pcall(cjson.decode, message)
+            if ok and type(data['headers']) == 'table' then
+                task_id = data['headers']['id']
+            end
+        end
+        if task_id and wanted[task_id] then
+            redis.call('LSET', KEYS[1], offset + i - 1, tombstone)
+            table.insert(removed, task_id)
+        end
+    end
+    if #chunk < window then
+        break
+    end
+    offset = offset + window
+end
+if #removed > 0 then
+    redis.call('LREM', KEYS[1], 0, tombstone)
+end
+return removed
+"""
+
+# Takes one of ARGV[2] leases of the group KEYS[1] for ARGV[1], expiring in ARGV[3] milliseconds.
+# Leases are scored with their expiry time, so that those of crashed workers are dropped.
+LEASE_ACQUIRE_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local ttl = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZSCORE', KEYS[1], ARGV[1]) or redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[2]) then
+    redis.call('ZADD', KEYS[1], now + ttl, ARGV[1])
+    redis.call('PEXPIRE', KEYS[1], ttl)
+    return 1
+end
+return 0
+"""
+
+# Coalesced queueing state of a record: missing (idle), 'queued', 'running' or 'dirty' (running,
+# and queued again meanwhile). Returns 1 if the caller has to publish the task.
+COALESCE_REQUEST_SCRIPT = """
+local state = redis.call('GET', KEYS[1])
+if not state then
+    redis.call('SET', KEYS[1], 'queued', 'PX', ARGV[1])
+    return 1
+end
+if state == 'running' then
+    redis.call('SET', KEYS[1], 'dirty', 'KEEPTTL')
+end
+return 0
+"""
+
+# Ends a coalesced run. Returns 1 if the record has been queued during the run and the caller
+# has to publish the follow-up. A retried task (ARGV[2]) is still queued.
+COALESCE_FINISH_SCRIPT = """
+local state = redis.call('GET', KEYS[1])
+if ARGV[2] == '1' or state == 'dirty' then
+    redis.call('SET', KEYS[1], 'queued', 'PX', ARGV[1])
+    return ARGV[2] == '1' and 0 or 1
+end
+redis.call('DEL', KEYS[1])
+return 0
+"""
+
+# Writes the progress of a tracking hash and samples its rate, as an exponential moving average
+# of items/sec weighted by the time elapsed since the previous sample (bounded to a few fields):
+# :started, :sampled (Redis TIME of the first and last sample), :sampled_progress and rate.
+# ARGV: "incr" or "set", value, ttl, half-life and min interval between samples (seconds)
+TRACK_PROGRESS_SCRIPT = """
+local progress
+if ARGV[1] == 'incr' then
+    progress = redis.call('HINCRBY', KEYS[1], 'progress', ARGV[2])
+else
+    redis.call('HSET', KEYS[1], 'progress', ARGV[2])
+    progress = tonumber(ARGV[2])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+if not progress then
+    return {ARGV[2], false}
+end
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local sample = redis.call('HMGET', KEYS[1], ':sampled', ':sampled_progress', 'rate')
+local sampled = tonumber(sample[1])
+if not sampled then
+    local baseline = progress
+    if ARGV[1] == 'incr' then
+        baseline = progress - tonumber(ARGV[2])
+    end
+    redis.call('HSET', KEYS[1], ':started', tostring(now), ':sampled', tostring(now), ':sampled_progress', baseline)
+    return {tostring(progress), false}
+end
+local elapsed = now - sampled
+if elapsed <= 0 or elapsed < tonumber(ARGV[5]) then
+    return {tostring(progress), sample[3]}
+end
+local rate = (progress - tonumber(sample[2])) / elapsed
+local previous = tonumber(sample[3])
+if previous then
+    rate = previous + (1 - math.exp(-elapsed * math.log(2) / tonumber(ARGV[4]))) * (rate - previous)
+end
+rate = string.format('%.6g', rate)
+redis.call('HSET', KEYS[1], ':sampled', tostring(now), ':sampled_progress', progress, 'rate', rate)
+return {tostring(progress), rate}
+"""
+
+# Releases a lock only if still owned by the caller
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+_HEADERS_MARKER = b'"headers": {'
+_PROPERTIES_MARKER = b', "properties": {'
+_decoder = json.JSONDecoder()
+
+
+class MessageInfo(NamedTuple):
+    id: str | None
+    task: str | None
+    eta: str | None
+
+
+def loads(data: bytes | str) -> Any:
+    """Deserialize a JSON document, using orjson if installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def decode_headers(message: bytes | str) -> dict[str, Any]:
+    """Return the headers of a raw kombu Redis message without decoding its body.
+
+    kombu serializes the (base64) body before the headers, so the headers object
+    is located from the end of the message and only that slice is parsed, by orjson
+    if installed when it is followed by the message properties.
+    Messages with a different layout are fully parsed.
+    """
+    if isinstance(message, str):
+        message = message.encode()
+    start = message.rfind(_HEADERS_MARKER)
+    if start >= 0:
+        if orjson is not None:
+            end = message.rfind(_PROPERTIES_MARKER, start)
+            if end > 0:
+                try:
+                    headers = orjson.loads(message[start + len(_HEADERS_MARKER) - 1 : end])
+                    if isinstance(headers, dict):
+                        return headers
+                except ValueError:
+                    pass
+        try:
+            headers, __ = _decoder.raw_decode(message[start + len(_HEADERS_MARKER) - 1 :].decode())
+            if isinstance(headers, dict):
+                return headers
+        except ValueError:
+            pass
+    return loads(message).get("headers") or {}
+
+
+def decode_message_info(message: bytes | str) -> MessageInfo:
+    """Return id, task name and ETA of a raw kombu Redis message."""
+    headers = decode_headers(message)
+    return MessageInfo(headers.get("id"), headers.get("task"), headers.get("eta"))
+
+
+def get_index_key(queue: str) -> str:
+    """Return the Redis key of the sorted set indexing `queue`."""
+    return f"{CELERY_BOOST_QUEUE_INDEX_KEY_PREFIX}:{queue}"
+
+
+def get_index_sequence_key(queue: str) -> str:
+    """Return the Redis key of the enqueue sequence of `queue`."""
+    return f"{get_index_key(queue)}:seq"
+
+
+def get_index_rebuilt_key(queue: str) -> str:
+    """Return the Redis key rate limiting the rebuilds of the index of `queue`."""
+    return f"{get_index_key(queue)}:rebuilt"
+
+
+def index_add(client: "Redis", queue: str, task_id: str) -> None:
+    """Register `task_id` as the newest entry of `queue`."""
+    script = client.register_script(INDEX_ADD_SCRIPT)
+    script(keys=[get_index_key(queue), get_index_sequence_key(queue)], args=[task_id])
+
+
+def index_remove(client: "Redis", queue: str, *task_ids: str) -> None:
+    """Remove `task_ids` from the index of `queue`."""
+    if task_ids:
+        client.zrem(get_index_key(queue), *task_ids)
+
+
+def index_position(client: "Redis", queue: str, task_id: str) -> int | None:
+    """Return the position of `task_id` in `queue` using the index.
+
+    The index is trusted only if it holds exactly as many entries as the queue.
+
+    Returns:
+        1-based position (1 is the next task to be consumed), 0 if the task is not queued
+        or None if the index is missing or stale.
+
+    """
+    key = get_index_key(queue)
+    pipe = client.pipeline(transaction=False)
+    pipe.zrank(key, str(task_id))
+    pipe.zcard(key)
+    pipe.llen(queue)
+    rank, indexed, size = pipe.execute()
+    if indexed != size:
+        return None
+    if rank is None:
+        return 0
+    return rank + 1
+
+
+def index_positions(client: "Redis", queue: str, task_ids: Iterable[str]) -> list[int] | None:
+    """Return the positions of many tasks in `queue` using the index, as `index_position()` does."""
+    ids = [str(task_id) for task_id in task_ids]
+    key = get_index_key(queue)
+    pipe = client.pipeline(transaction=False)
+    for task_id in ids:
+        pipe.zrank(key, task_id)
+    pipe.zcard(key)
+    pipe.llen(queue)
+    *ranks, indexed, size = pipe.execute()
+    if indexed != size:
+        return None
+    return [0 if rank is None else rank + 1 for rank in ranks]
+
+
+def index_members(client: "Redis", queue: str, task_ids: Iterable[str]) -> set[str] | None:
+    """Return which of `task_ids` are in `queue` using the index.
+
+    Returns:
+        the set of queued ids or None if the index is missing or stale.
+
+    """
+    ids = [str(task_id) for task_id in task_ids]
+    if not ids:
+        return set()
+    key = get_index_key(queue)
+    pipe = client.pipeline(transaction=False)
+    pipe.zmscore(key, ids)
+    pipe.zcard(key)
+    pipe.llen(queue)
+    scores, indexed, size = pipe.execute()
+    if indexed != size:
+        return None
+    return {task_id for task_id, score in zip(ids, scores) if score is not None}
+
+
+def rebuild_index(client: "Redis", queue: str, task_ids: Iterable[str] = ()) -> list[int]:
+    """Replace the index of `queue` with the ids of its messages, server side.
+
+    The queue is read and the index written by a single script, so publishes and consumers
+    cannot interleave with the rebuild. It blocks Redis for O(queue length).
+
+    Args:
+        client: Redis client
+        queue: name of the queue
+        task_ids: ids of the tasks to look for in the rebuilt index
+
+    Returns:
+        1-based positions (0 if the task is not queued) in the same order of `task_ids`.
+
+    """
+    script = client.register_script(REBUILD_INDEX_SCRIPT)
+    positions = script(
+        keys=[queue, get_index_key(queue)],
+        args=[CELERY_BOOST_QUEUE_SCAN_WINDOW, *(str(task_id) for task_id in task_ids)],
+    )
+    return [int(pos) for pos in positions]
+
+
+def try_rebuild_index(client: "Redis", queue: str, task_ids: Iterable[str] = ()) -> list[int] | None:
+    """Rebuild the index of `queue`, at most once every `CELERY_BOOST_QUEUE_INDEX_REBUILD_INTERVAL` seconds.
+
+    The index is briefly out of sync while tasks are published or received, and stays so if some
+    consumers do not prune it, so the blocking rebuild is shared by all processes and rate limited.
+
+    Returns:
+        the positions of `task_ids` as `rebuild_index()`, or None if the index was rebuilt recently.
+
+    """
+    if CELERY_BOOST_QUEUE_INDEX_REBUILD_INTERVAL <= 0:
+        return None
+    key = get_index_rebuilt_key(queue)
+    if not client.set(key, 1, nx=True, px=int(CELERY_BOOST_QUEUE_INDEX_REBUILD_INTERVAL * 1000)):
+        return None
+    return rebuild_index(client, queue, task_ids)
+
+
+def scan_queue(
+    client: "Redis", queue: str, window: int | None = None, from_tail: bool = False
+) -> Generator[tuple[int, bytes], None, None]:
+    """Walk `queue` in LRANGE windows, yielding messages as they are fetched.
+
+    Only one window is held in memory and nothing else is fetched once the caller stops iterating.
+    Scanning from the head never misses a message that stays queued during the scan, but may yield
+    it twice if new messages are published meanwhile. Scanning from the tail reaches the next messages
+    to be consumed first, but may skip entries while workers consume the queue.
+
+    Args:
+        client: Redis client
+        queue: name of the queue
+        window: number of messages fetched per round-trip. Defaults to `CELERY_BOOST_QUEUE_SCAN_WINDOW`
+        from_tail: start from the next message to be consumed
+
+    Yields:
+        tuples (position, message) where position is 1-based (1 is the next task to be consumed)
+
+    """
+    window = window or CELERY_BOOST_QUEUE_SCAN_WINDOW
+    offset = 0
+    while True:
+        pipe = client.pipeline(transaction=True)
+        pipe.llen(queue)
+        if from_tail:
+            pipe.lrange(queue, -offset - window, -offset - 1)
+        else:
+            pipe.lrange(queue, offset, offset + window - 1)
+        size, chunk = pipe.execute()
+        if from_tail:
+            for i, message in enumerate(reversed(chunk)):
+                yield offset + i + 1, message
+        else:
+            for i, message in enumerate(chunk):
+                yield size - offset - i, message
+        if len(chunk) < window:
+            break
+        offset += window
+
+
+def script_position(client: "Redis", queue: str, task_id: str) -> int:
+    """Return the position of `task_id` in `queue` computed server side.
+
+    Returns:
+        1-based position (1 is the next task to be consumed) or 0 if the task is not queued.
+
+    """
+    script = client.register_script(QUEUE_POSITION_SCRIPT)
+    return int(script(keys=[queue], args=[str(task_id), CELERY_BOOST_QUEUE_SCAN_WINDOW]))
+
+
+def script_find(client: "Redis", queue: str, task_id: str) -> bytes | None:
+    """Return the raw message of `task_id` in `queue`, or None if the task is not queued."""
+    script = client.register_script(QUEUE_FIND_SCRIPT)
+    position, message = script(keys=[queue], args=[str(task_id), CELERY_BOOST_QUEUE_SCAN_WINDOW])
+    return message if position else None
+
+
+def script_filter(client: "Redis", queue: str, task_ids: Iterable[str]) -> set[str]:
+    """Return which of `task_ids` are in `queue`, scanning it server side."""
+    ids = [str(task_id) for task_id in task_ids]
+    if not ids:
+        return set()
+    script = client.register_script(QUEUE_FILTER_SCRIPT)
+    found = script(keys=[queue], args=[CELERY_BOOST_QUEUE_SCAN_WINDOW, *ids])
+    return {task_id.decode() if isinstance(task_id, bytes) else task_id for task_id in found}
+
+
+def script_remove(client: "Redis", queue: str, revoked_queue: str, task_id: str) -> bool:
+    """Atomically remove `task_id` from `queue` and add it to `revoked_queue`.
+
+    Returns:
+        True if the message was found and removed.
+
+    """
+    script = client.register_script(QUEUE_REMOVE_SCRIPT)
+    keys = [queue, revoked_queue, get_index_key(queue)]
+    return bool(script(keys=keys, args=[str(task_id), CELERY_BOOST_QUEUE_SCAN_WINDOW]))
+
+
+def script_remove_many(client: "Redis", queue: str, revoked_queue: str, task_ids: Iterable[str]) -> set[str]:
+    """Remove many tasks from `queue` and flag them as revoked in one atomic step.
+
+    Returns:
+        the ids of the tasks that were queued
+
+    """
+    ids = [str(task_id) for task_id in task_ids]
+    if not ids:
+        return set()
+    script = client.register_script(QUEUE_REMOVE_MANY_SCRIPT)
+    removed = script(
+        keys=[queue, revoked_queue, get_index_key(queue)],
+        args=[CELERY_BOOST_QUEUE_SCAN_WINDOW, f"celery-boost-removed:{uuid.uuid4().hex}", *ids],
+    )
+    return {task_id.decode() if isinstance(task_id, bytes) else task_id for task_id in removed}
+
+
+def get_snapshot_key(queue: str) -> str:
+    """Return the Redis key of the hash holding the snapshot of `queue`."""
+    return f"{CELERY_BOOST_QUEUE_SNAPSHOT_KEY_PREFIX}:{queue}"
+
+
+def build_snapshot(client: "Redis", queue: str) -> dict[str, int]:
+    """Scan `queue` and store the position of each task id in its snapshot.
+
+    Returns:
+        Dictionary task_id -> position
+
+    """
+    positions: dict[str, int] = {}
+    for pos, message in scan_queue(client, queue):
+        task_id = decode_headers(message).get("id")
+        if task_id:
+            # scanning from the head, a duplicated id keeps the entry closest to consumption
+            positions[task_id] = pos
+    key = get_snapshot_key(queue)
+    pipe = client.pipeline(transaction=True)
+    pipe.delete(key)
+    mapping: dict[Any, float] = {**positions, SNAPSHOT_BUILT_FIELD: time.time()}
+    pipe.hset(key, mapping=mapping)
+    pipe.expire(key, SNAPSHOT_EXPIRE)
+    pipe.execute()
+    return positions
+
+
+def snapshot_positions(client: "Redis", queue: str, task_ids: Iterable[str], max_age: float) -> list[int] | None:
+    """Return the positions of `task_ids` from the shared snapshot of `queue`.
+
+    A snapshot older than `max_age` seconds is rebuilt by the first caller that acquires
+    the rebuild lock. Meanwhile the others keep reading the stale snapshot, as long as it is
+    not older than `max_age` plus the lock timeout, so that a rebuild does not send every
+    caller scanning the queue.
+
+    Args:
+        client: Redis client
+        queue: name of the queue
+        task_ids: ids of the tasks to look for
+        max_age: maximum accepted age of the snapshot, in seconds
+
+    Returns:
+        1-based positions (0 if the task is not queued) in the same order of `task_ids`,
+        or None if the snapshot is missing or too old and being rebuilt by someone else.
+
+    """
+    ids = [str(task_id) for task_id in task_ids]
+    key = get_snapshot_key(queue)
+    built, *positions = client.hmget(key, [SNAPSHOT_BUILT_FIELD, *ids])
+    age = time.time() - float(built) if built is not None else math.inf
+    if age <= max_age:
+        return [int(pos) if pos is not None else 0 for pos in positions]
+    lock = f"{key}:lock"
+    token = uuid.uuid4().hex
+    if not client.set(lock, token, nx=True, px=SNAPSHOT_LOCK_TIMEOUT):
+        if age <= max_age + SNAPSHOT_LOCK_TIMEOUT / 1000:
+            return [int(pos) if pos is not None else 0 for pos in positions]
+        return None
+    try:
+        snapshot = build_snapshot(client, queue)
+    finally:
+        client.register_script(RELEASE_LOCK_SCRIPT)(keys=[lock], args=[token])
+    return [snapshot.get(task_id, 0) for task_id in ids]
+
+
+def get_group_key(group: str) -> str:
+    """Return the Redis key of the sorted set holding the leases of `group`."""
+    return f"{CELERY_BOOST_GROUP_KEY_PREFIX}:{group}"
+
+
+def lease_acquire(client: "Redis", group: str, token: str, limit: int, ttl: float) -> bool:
+    """Take a lease of `group` unless `limit` leases are already taken.
+
+    Args:
+        client: Redis client
+        group: name of the group
+        token: lease owner. Acquiring again with the same token renews the lease
+        limit: maximum number of concurrent leases
+        ttl: seconds after which the lease expires if not released
+
+    Returns:
+        True if the lease has been acquired
+
+    """
+    script = client.register_script(LEASE_ACQUIRE_SCRIPT)
+    return bool(script(keys=[get_group_key(group)], args=[str(token), limit, max(int(ttl * 1000), 1)]))
+
+
+def lease_release(client: "Redis", group: str, token: str) -> None:
+    """Release the lease of `group` owned by `token`."""
+    client.zrem(get_group_key(group), str(token))
+
+
+def get_coalesce_key(label: str, pk: Any) -> str:
+    """Return the Redis key holding the coalesced queueing state of a record."""
+    return f"{CELERY_BOOST_COALESCE_KEY_PREFIX}:{label}:{pk}"
+
+
+def coalesce_request(client: "Redis", key: str, ttl: float) -> bool:
+    """Register a queueing request, returning True if the task has to be published."""
+    script = client.register_script(COALESCE_REQUEST_SCRIPT)
+    return bool(script(keys=[key], args=[max(int(ttl * 1000), 1)]))
+
+
+def coalesce_start(client: "Redis", key: str, ttl: float) -> None:
+    """Flag the coalesced task as running, so that new requests schedule a follow-up."""
+    client.set(key, "running", px=max(int(ttl * 1000), 1))
+
+
+def coalesce_finish(client: "Redis", key: str, ttl: float, retry: bool = False) -> bool:
+    """End a coalesced run, returning True if a follow-up has to be published."""
+    script = client.register_script(COALESCE_FINISH_SCRIPT)
+    return bool(script(keys=[key], args=[max(int(ttl * 1000), 1), "1" if retry else "0"]))
+
+
+def get_tracking_channel(task_id: str) -> str:
+    """Return the Redis pub/sub channel publishing the tracking changes of a task."""
+    return f"{CELERY_BOOST_TRACKING_CHANNEL_PREFIX}:{task_id}"
+
+
+def track_progress(
+    client: "Redis", key: str, value: str | int, incr: bool, ttl: int, half_life: float, interval: float
+) -> Any:
+    """Write the progress of the tracking hash `key`, updating its rate (see `TRACK_PROGRESS_SCRIPT`).
+
+    `client` can be a pipeline, in which case the result is returned by its `execute()`.
+
+    Returns:
+        `[progress, rate]`, rate is None until two samples `interval` seconds apart are recorded.
+
+    """
+    script = client.register_script(TRACK_PROGRESS_SCRIPT)
+    return script(keys=[key], args=["incr" if incr else "set", value, ttl, half_life, interval])
+
+
+class QueueStats(NamedTuple):
+    size: int
+    canceled: int
+    reserved: int
+    next_id: str | None
+
+
+def queue_stats(
+    client: "Redis", queues: Iterable[str], revoked_queue: str, unacked_key: str = "unacked", scan: bool = False
+) -> tuple[int, dict[str, QueueStats]]:
+    """Return the number of revoked tasks and the statistics of each queue.
+
+    Canceled tasks are counted with the queue index (see `CELERY_BOOST_QUEUE_INDEX`).
+    Without an up to date index they are reported as 0, unless `scan` is True.
+    The messages reserved by workers are counted by queue with `CELERY_BOOST_QUEUE_SCRIPTS`, otherwise
+    `reserved` is the total of all the queues, so that the reserved messages are not downloaded.
+
+    Args:
+        client: Redis client
+        queues: names of the queues
+        revoked_queue: name of the set of revoked task ids
+        unacked_key: name of the hash where kombu stores the messages reserved by workers
+        scan: count canceled tasks scanning the queues when the index is not available (O(queue length))
+
+    Returns:
+        tuple (revoked, {queue: QueueStats})
+
+    """
+    queues = list(queues)
+    if CELERY_BOOST_QUEUE_SCRIPTS:
+        keys = [revoked_queue, unacked_key]
+        for queue in queues:
+            keys.extend([queue, get_index_key(queue)])
+        script = client.register_script(QUEUE_STATS_SCRIPT)
+        revoked, *values = script(
+            keys=keys,
+            args=["1" if CELERY_BOOST_QUEUE_INDEX else "0", CELERY_BOOST_QUEUE_SCAN_WINDOW, "1" if scan else "0"],
+        )
+        stats = {}
+        for i, queue in enumerate(queues):
+            size, canceled, reserved, next_id = values[i * 4 : i * 4 + 4]
+            stats[queue] = QueueStats(size, canceled, reserved, next_id.decode() if next_id else None)
+        return revoked, stats
+
+    pipe = client.pipeline(transaction=False)
+    pipe.scard(revoked_queue)
+    # splitting the reserved messages by queue would download all of them
+    pipe.hlen(unacked_key)
+    for queue in queues:
+        pipe.llen(queue)
+        pipe.lindex(queue, -1)
+        if CELERY_BOOST_QUEUE_INDEX:
+            pipe.zcard(get_index_key(queue))
+    revoked, reserved, *values = pipe.execute()
+    step = 3 if CELERY_BOOST_QUEUE_INDEX else 2
+    sizes = {queue: values[i * step] for i, queue in enumerate(queues)}
+    indexed = [
+        queue
+        for i, queue in enumerate(queues)
+        if sizes[queue] and values[i * step + 2 : i * step + 3] == [sizes[queue]]
+    ]
+    scanned = [queue for queue in queues if scan and sizes[queue] and queue not in indexed]
+    canceled = dict.fromkeys(queues, 0)
+    if revoked and (indexed or scanned):
+        # as QUEUE_STATS_SCRIPT, iterate the smaller of the revoked set and the index of each queue
+        by_revoked = [queue for queue in indexed if revoked <= sizes[queue]]
+        by_index = [queue for queue in indexed if revoked > sizes[queue]]
+        pipe = client.pipeline(transaction=False)
+        if by_revoked or scanned:
+            pipe.smembers(revoked_queue)
+        for queue in by_index:
+            pipe.zrange(get_index_key(queue), 0, -1)
+        results = pipe.execute()
+        members = results.pop(0) if by_revoked or scanned else set()
+        revoked_ids = [m.decode() if isinstance(m, bytes) else m for m in members]
+        # (queue, ids looked up in the other set) pairs
+        lookups = [(queue, ids) for queue, ids in zip(by_index, results) if ids]
+        if revoked_ids:
+            lookups.extend((queue, revoked_ids) for queue in by_revoked)
+        pipe = client.pipeline(transaction=False)
+        for queue, ids in lookups:
+            if queue in by_index:
+                pipe.smismember(revoked_queue, ids)
+            else:
+                pipe.zmscore(get_index_key(queue), ids)
+        for (queue, __), found in zip(lookups, pipe.execute() if lookups else []):
+            # SMISMEMBER returns 0/1 and ZMSCORE None for missing members (0 is a valid score)
+            canceled[queue] = sum(value == 1 if queue in by_index else value is not None for value in found)
+        for queue in scanned:
+            wanted = set(revoked_ids)
+            for __, task in scan_queue(client, queue):
+                canceled[queue] += decode_headers(task).get("id") in wanted
+    stats = {}
+    for i, queue in enumerate(queues):
+        message = values[i * step + 1]
+        stats[queue] = QueueStats(
+            sizes[queue], canceled[queue], reserved, decode_headers(message).get("id") if message else None
+        )
+    return revoked, stats
+
+
+def _routing_key(delivery_info: dict[str, Any] | None) -> str | None:
+    return (delivery_info or {}).get("routing_key")
+
+
+def _prune_index(queue: str | None, task_id: str | None) -> None:
+    if not (CELERY_BOOST_QUEUE_INDEX and queue and task_id):
+        return
+    try:
+        with current_app.pool.acquire(block=True) as conn:
+            index_remove(conn.default_channel.client, queue, task_id)
+    except Exception as e:  # noqa
+        logger.exception(e)
+
+
+@signals.before_task_publish.connect
+def index_published_task(
+    sender: str | None = None, headers: dict | None = None, routing_key: str | None = None, **kwargs: Any
+) -> None:
+    if not CELERY_BOOST_QUEUE_INDEX:
+        return
+    task_id = (headers or {}).get("id")
+    if not (task_id and routing_key):
+        return
+    try:
+        with current_app.pool.acquire(block=True) as conn:
+            index_add(conn.default_channel.client, routing_key, task_id)
+    except Exception as e:  # noqa
+        logger.exception(e)
+
+
+@signals.task_received.connect
+def prune_received_task(sender: Any = None, request: Any = None, **kwargs: Any) -> None:
+    _prune_index(_routing_key(getattr(request, "delivery_info", None)), getattr(request, "id", None))
+
+
+@signals.task_revoked.connect
+def prune_revoked_task(sender: Any = None, request: Any = None, **kwargs: Any) -> None:
+    _prune_index(_routing_key(getattr(request, "delivery_info", None)), getattr(request, "id", None))
+
+
+@signals.task_unknown.connect
+def prune_unknown_task(sender: Any = None, id: str | None = None, message: Any = None, **kwargs: Any) -> None:  # noqa: A002
+    _prune_index(_routing_key(getattr(message, "delivery_info", None)), id)
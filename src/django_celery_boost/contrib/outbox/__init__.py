@@ -0,0 +1,10 @@
+"""Transactional outbox for `CeleryTaskModel.celery_queue_outbox`.
+
+Add the app to `INSTALLED_APPS` and run `migrate` to create its table:
+
+    INSTALLED_APPS = [
+        ...
+        "django_celery_boost",
+        "django_celery_boost.contrib.outbox",
+    ]
+"""
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class Config(AppConfig):
+    name = "django_celery_boost.contrib.outbox"
+    label = "celery_boost_outbox"
+    verbose_name = "Celery Boost Outbox"
+    default_auto_field = "django.db.models.BigAutoField"
@@ -0,0 +1,29 @@
+import time
+from typing import Any
+
+from django.core.management import BaseCommand, CommandParser
+
+from django_celery_boost.contrib.outbox.models import TaskOutbox
+
+
+class Command(BaseCommand):
+    help = "Publish the tasks queued in the outbox"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=500, help="Entries processed per transaction")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep relaying, waiting INTERVAL seconds when the outbox is empty",
+        )
+
+    def handle(self, *args: Any, batch_size: int = 500, interval: float = 0, **options: Any) -> None:
+        while True:
+            total = TaskOutbox.objects.relay(batch_size=batch_size)
+            if options["verbosity"] > 1 or (total and not interval):
+                self.stdout.write(f"{total} tasks published")
+            if not interval:
+                break
+            if not total:
+                time.sleep(interval)
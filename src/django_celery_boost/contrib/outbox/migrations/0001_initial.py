@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskOutbox",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("model", models.CharField(help_text="app_label.model_name of the record", max_length=255)),
+                ("object_pk", models.CharField(max_length=255)),
+                ("task_id", models.CharField(max_length=36, unique=True)),
+                ("version", models.BigIntegerField(blank=True, help_text="Version the task must process", null=True)),
+                ("datetime_created", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("model", "object_pk"), name="unique_outbox_record")],
+            },
+        ),
+    ]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import cast
+
+from django.apps import apps
+from django.db import models, transaction
+
+from django_celery_boost.models import CeleryTaskModel
+from django_celery_boost.signals import tasks_queued
+
+logger = logging.getLogger(__name__)
+
+
+class TaskOutboxManager(models.Manager["TaskOutbox"]):
+    def relay(self, batch_size: int = 500) -> int:
+        """Publish the tasks stored in the outbox.
+
+        Each batch is processed in one transaction: the entries are deleted and the tasks of
+        the records still pointing to them are published on one producer connection when the
+        transaction commits, applying the backpressure of the model (see `celery_queue_backpressure`).
+        Entries that could not be published are stored again for the next run, the ones of deleted
+        or queued again records are dropped. `tasks_queued` is sent for each model.
+
+        Args:
+            batch_size: number of entries processed per transaction
+
+        Returns:
+            number of processed entries
+
+        """
+        total = 0
+        while True:
+            with transaction.atomic():
+                batch = list(self.select_for_update(skip_locked=True).order_by("pk")[:batch_size])
+                if not batch:
+                    break
+                by_model: dict[str, list[TaskOutbox]] = {}
+                for entry in batch:
+                    by_model.setdefault(entry.model, []).append(entry)
+                for label, entries in by_model.items():
+                    self._prepare(cast(type[CeleryTaskModel], apps.get_model(label)), entries)
+                self.filter(pk__in=[entry.pk for entry in batch]).delete()
+            total += len(batch)
+            if len(batch) < batch_size:
+                break
+        return total
+
+    def _prepare(self, model: type[CeleryTaskModel], entries: list[TaskOutbox]) -> None:
+        records = model._base_manager.in_bulk([entry.object_pk for entry in entries])
+        records = {str(pk): obj for pk, obj in records.items()}
+        publish, objs, dropped = [], [], []
+        for entry in entries:
+            obj = records.get(entry.object_pk)
+            # the record may have been deleted, terminated or queued again since the request
+            if obj is not None and obj.curr_async_result_id == entry.task_id:
+                publish.append(entry)
+                objs.append(obj)
+            else:
+                dropped.append(entry)
+        transaction.on_commit(lambda: self._publish(model, publish, objs, dropped))
+
+    def _publish(
+        self,
+        model: type[CeleryTaskModel],
+        entries: list[TaskOutbox],
+        objs: list[CeleryTaskModel],
+        dropped: list[TaskOutbox],
+    ) -> None:
+        for entry in dropped:
+            try:
+                model.celery_app.backend.mark_as_revoked(entry.task_id, reason="dropped by the outbox relay")
+            except Exception as e:  # noqa
+                logger.exception(e)
+        if not entries:
+            return
+        task = model.task_handler
+        published = 0
+        try:
+            countdown = model._apply_backpressure()
+            with model.celery_app.producer_or_acquire() as producer:
+                for entry, obj in zip(entries, objs):
+                    task.apply_async(
+                        (obj.pk, entry.version), task_id=entry.task_id, countdown=countdown, producer=producer
+                    )
+                    published += 1
+        except Exception as e:  # noqa
+            logger.exception(e)
+            self.bulk_create(
+                [
+                    TaskOutbox(
+                        model=entry.model, object_pk=entry.object_pk, task_id=entry.task_id, version=entry.version
+                    )
+                    for entry in entries[published:]
+                ],
+                ignore_conflicts=True,
+            )
+        if published:
+            tasks_queued.send(sender=model, tasks=objs[:published])
+
+
+class TaskOutbox(models.Model):
+    """Queueing requests waiting to be published (see `CeleryTaskModel.celery_queue_outbox`)."""
+
+    id: models.BigAutoField[int, int] = models.BigAutoField(primary_key=True)
+    model: models.CharField[str, str] = models.CharField(max_length=255, help_text="app_label.model_name of the record")
+    object_pk: models.CharField[str, str] = models.CharField(max_length=255)
+    task_id: models.CharField[str, str] = models.CharField(max_length=36, unique=True)
+    version: models.BigIntegerField[int | None, int | None] = models.BigIntegerField(
+        blank=True, null=True, help_text="Version the task must process"
+    )
+    datetime_created: models.DateTimeField[datetime, datetime] = models.DateTimeField(auto_now_add=True)
+
+    objects = TaskOutboxManager()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["model", "object_pk"], name="unique_outbox_record")]
+
+    def __str__(self) -> str:
+        return f"{self.model}:{self.object_pk}"
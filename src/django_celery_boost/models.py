@@ -3,26 +3,37 @@ from __future__ import annotations
 import base64
 import json
 import logging
-from typing import TYPE_CHECKING, Any, Callable, Generator
+import math
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Callable, Generator, Iterable, Iterator, NamedTuple, Sequence, cast
 
 import sentry_sdk
-from celery import states, Signature
+from asgiref.sync import sync_to_async
+from celery import chord, group, signals as celery_signals, states, Signature
+from celery.exceptions import MaxRetriesExceededError, Retry
+from celery.utils import uuid
 from celery.app.base import Celery
+from celery.backends.base import BaseKeyValueStoreBackend
 from concurrency.api import concurrency_disable_increment
 from concurrency.fields import AutoIncVersionField
+from django.apps import apps
 from django.conf import settings
 from django.core import checks
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.functional import classproperty
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext as _
 
-from django_celery_boost.signals import task_queued, task_revoked, task_terminated, task_canceled
+from django_celery_boost import aio, broker
+from django_celery_boost.signals import task_queued, task_revoked, task_terminated, task_canceled, tasks_queued
 from django_celery_boost.task import TaskRunFromSignature
 
 if TYPE_CHECKING:
     import celery.app.control
+    from celery import Task
     from celery.result import AsyncResult
     from kombu.connection import Connection
     from kombu.transport.redis import Channel
@@ -31,10 +42,55 @@ logger = logging.getLogger(__name__)
 
 CELERY_BOOST_TRACKING_TTL = getattr(settings, "CELERY_BOOST_TRACKING_TTL", 86400 * 2)
 CELERY_BOOST_TRACKING_KEY_PREFIX = getattr(settings, "CELERY_BOOST_TRACKING_KEY_PREFIX", "celery:task:tracking")
+CELERY_BOOST_TRACKING_PUBLISH = getattr(settings, "CELERY_BOOST_TRACKING_PUBLISH", False)
+CELERY_BOOST_STATUS_CACHE_TTL = getattr(settings, "CELERY_BOOST_STATUS_CACHE_TTL", 0)
+CELERY_BOOST_QUEUE_ON_COMMIT = getattr(settings, "CELERY_BOOST_QUEUE_ON_COMMIT", False)
+CELERY_BOOST_QUEUE_OUTBOX = getattr(settings, "CELERY_BOOST_QUEUE_OUTBOX", False)
+CELERY_BOOST_QUEUE_DEPTH_INTERVAL = getattr(settings, "CELERY_BOOST_QUEUE_DEPTH_INTERVAL", 1)
 
 
 APP_LABEL = "app_label"
 MODEL_NAME = "model_name"
+FAN_OUT = "fan_out"
+# message header identifying the record of coalesced tasks
+COALESCE_HEADER = "celery_boost_coalesce"
+# message header counting the times a task waited for a `group_key` lease
+GROUP_WAITS_HEADER = "celery_boost_group_waits"
+# tracking hash field holding the time of the first progress update (see `broker.TRACK_PROGRESS_SCRIPT`)
+PROGRESS_STARTED_FIELD = f"{broker.TRACKING_INTERNAL_PREFIX}started"
+
+
+def _decode_tracking_data(data: "dict[bytes | str, bytes | str | None]", internal: bool = False) -> "dict[str, str]":
+    """Decode bytes to strings if needed (Redis returns bytes).
+
+    The fields kept by the library (see `broker.TRACKING_INTERNAL_PREFIX`) are dropped unless `internal`.
+    """
+    decoded = {
+        (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+        for k, v in data.items()
+        if v is not None
+    }
+    return _select_tracking_data(decoded, (), internal)
+
+
+def _select_tracking_data(data: "dict[str, str]", fields: "Sequence[str]", internal: bool = False) -> "dict[str, str]":
+    """Return the `fields` of already decoded tracking data (all if empty), without the internal ones."""
+    if fields:
+        data = {field: data[field] for field in fields if field in data}
+    if not internal:
+        data = {k: v for k, v in data.items() if not k.startswith(broker.TRACKING_INTERNAL_PREFIX)}
+    return data
+
+
+def _publish_tracking(client: Any, task_id: str, data: "dict[str, str]", always: bool = False) -> None:
+    """Publish changed tracking fields on the channel of the task (see `CELERY_BOOST_TRACKING_PUBLISH`)."""
+    if always or CELERY_BOOST_TRACKING_PUBLISH:
+        client.publish(broker.get_tracking_channel(task_id), json.dumps(data))
+
+
+def _decode_progress(result: "Sequence[bytes | None]") -> "dict[str, str]":
+    """Decode the result of `broker.track_progress()`."""
+    return _decode_tracking_data(dict(zip(("progress", "rate"), result)))
 
 
 class InvalidTaskBase(TypeError):
@@ -44,7 +100,303 @@ class InvalidTaskBase(TypeError):
         )
 
 
-class CeleryManager:
+class QueueFull(Exception):
+    def __init__(self, queue: str, size: int):
+        self.queue = queue
+        self.size = size
+        super().__init__(f"Queue {queue} is full ({size} tasks)")
+
+
+class ProgressStats(NamedTuple):
+    progress: str | None
+    total: str | None
+    rate: float | None
+    elapsed: timedelta | None
+    eta: timedelta | None
+
+
+# per process cache of queue sizes: queue -> (monotonic time, size)
+_queue_depth: dict[str, tuple[float, int]] = {}
+# per process backpressure state of each model: label -> saturated
+_saturated: dict[str, bool] = {}
+
+
+class ProgressReporter:
+    """Buffer tracking updates of a record and write them in one pipelined round-trip.
+
+    Updates are written at most every `interval` seconds or `max_updates` updates,
+    and always when leaving the context manager, even on error: in that case flush errors
+    are logged so that they do not hide the exception raised by the task.
+    """
+
+    def __init__(self, obj: "CeleryTaskModel", interval: float = 0.5, max_updates: int = 1000):
+        self.obj = obj
+        self.interval = interval
+        self.max_updates = max_updates
+        self._values: dict[str, str] = {}
+        self._progress: str | None = None
+        self._increment = 0
+        self._updates = 0
+        self._flushed_at = time.monotonic()
+
+    def __enter__(self) -> "ProgressReporter":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *args: Any) -> None:
+        if exc_type is None:
+            self.flush()
+            return
+        try:
+            self.flush()
+        except Exception as e:  # noqa
+            logger.exception(e)
+
+    def set(self, field: str, value: str | int) -> None:
+        """Buffer a tracking field."""
+        if field == "progress":
+            self._progress = str(value)
+            self._increment = 0
+        else:
+            self._values[field] = str(value)
+        self._updated()
+
+    def set_total(self, value: str | int) -> None:
+        self.set("total", value)
+
+    def set_progress(self, value: str | int) -> None:
+        self.set("progress", value)
+
+    def incr_progress(self, amount: int = 1) -> None:
+        """Buffer an increment of the progress count, written with HINCRBY."""
+        if self._progress is None:
+            self._increment += amount
+        else:
+            self._progress = str(int(self._progress) + amount)
+        self._updated()
+
+    def _updated(self) -> None:
+        self._updates += 1
+        if self._updates >= self.max_updates or time.monotonic() - self._flushed_at >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered updates."""
+        self._flushed_at = time.monotonic()
+        self._updates = 0
+        progress = self._progress is not None or self._increment
+        if not (self._values or progress) or not self.obj.curr_async_result_id:
+            return
+        with self.obj.celery_app.pool.acquire(block=True) as conn:
+            key = self.obj._get_tracking_key()
+            pipe = conn.default_channel.client.pipeline(transaction=False)
+            if self._values:
+                pipe.hset(key, mapping=self._values)
+                pipe.expire(key, CELERY_BOOST_TRACKING_TTL)
+            if self._progress is not None:
+                self.obj._track_progress(pipe, self._progress)
+            elif self._increment:
+                self.obj._track_progress(pipe, self._increment, incr=True)
+            result = pipe.execute()
+            if progress:
+                self._values.update(_decode_progress(result[-1]))
+            _publish_tracking(conn.default_channel.client, self.obj.curr_async_result_id, self._values)
+        self._values = {}
+        self._progress = None
+        self._increment = 0
+
+
+class CancellationToken:
+    """Cooperative cancellation flag of a task, cheap enough to be checked for each item of a loop.
+
+    By default the flag set by `request_cancellation()` is read from Redis at most every `interval` seconds.
+    With `push=True` a background thread subscribes to the tracking channel of the task and
+    checking the token is a local attribute read. The thread is stopped when leaving the context manager.
+    """
+
+    def __init__(self, obj: "CeleryTaskModel", interval: float = 0.5, push: bool = False):
+        self.obj = obj
+        self.interval = interval
+        self._cancelled = False
+        self._refresh_at = 0.0
+        self._pubsub: Any = None
+        self._thread: Any = None
+        if push and obj.curr_async_result_id:
+            self._subscribe()
+
+    def __enter__(self) -> "CancellationToken":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __bool__(self) -> bool:
+        return self.cancelled
+
+    @property
+    def cancelled(self) -> bool:
+        """Return True if cancellation was requested."""
+        if not (self._cancelled or self._thread) and time.monotonic() >= self._refresh_at:
+            self.refresh()
+        return self._cancelled
+
+    def refresh(self) -> bool:
+        """Read the cancellation flag from Redis."""
+        self._refresh_at = time.monotonic() + self.interval
+        self._cancelled = self._cancelled or self.obj.is_termination_requested
+        return self._cancelled
+
+    def _subscribe(self) -> None:
+        with self.obj.celery_app.pool.acquire(block=True) as conn:
+            self._pubsub = conn.default_channel.client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{broker.get_tracking_channel(self.obj.curr_async_result_id): self._on_message})
+        self._thread = self._pubsub.run_in_thread(
+            sleep_time=self.interval, daemon=True, exception_handler=self._on_error
+        )
+        # requests sent before the subscription
+        self.refresh()
+
+    def _on_message(self, message: dict[str, Any]) -> None:
+        if json.loads(message["data"]).get("terminate_requested") == "1":
+            self._cancelled = True
+
+    def _on_error(self, e: Exception, pubsub: Any, thread: Any) -> None:
+        # fall back to polling, the worker thread closes the pubsub when it stops
+        logger.exception(e)
+        thread.stop()
+        self._thread = None
+        self._pubsub = None
+
+    def close(self) -> None:
+        """Stop listening to cancellation requests."""
+        if self._thread is not None:
+            # the worker thread closes the pubsub when it stops
+            self._thread.stop()
+            self._thread.join(self.interval + 1)
+            self._thread = None
+        elif self._pubsub is not None:
+            self._pubsub.close()
+        self._pubsub = None
+
+
+class CeleryQuerySet(models.QuerySet):
+    def bulk_queue(self, use_version: bool = True, batch_size: int | None = None) -> "dict[Any, str]":
+        """Queue the processing of all the instances whose task is not active.
+
+        Statuses are resolved in bulk, pre-generated task ids are written to `curr_async_result_id`/`datetime_queued`
+        with one `bulk_update()` before publishing, so that workers always find their id stored,
+        and all messages are published on the same producer connection. A single `tasks_queued` signal is sent instead of `task_queued`
+        for each instance. Backpressure is applied once for the whole batch (see `celery_queue_backpressure`).
+
+        Args:
+            use_version: if True each task fails if its record is changed after it has been queued
+            batch_size: number of records per UPDATE statement
+
+        Returns:
+            Dictionary pk -> task id of the queued instances
+
+        """
+        model = self.model
+        objs = list(self)
+        statuses = model.bulk_task_status(objs)
+        objs = [obj for obj in objs if statuses[obj.pk] not in model.ACTIVE_STATUSES]
+        if not objs:
+            return {}
+        countdown = model._apply_backpressure()
+        task = model.task_handler
+        now = timezone.now()
+        for obj in objs:
+            obj.curr_async_result_id = uuid()
+            obj.datetime_queued = now
+            obj.clear_status_cache()
+        model._base_manager.bulk_update(objs, ["curr_async_result_id", "datetime_queued"], batch_size=batch_size)
+        with model.celery_app.producer_or_acquire() as producer:
+            for obj in objs:
+                task.apply_async(
+                    (obj.pk, obj.version if use_version else None),
+                    task_id=obj.curr_async_result_id,
+                    countdown=countdown,
+                    producer=producer,
+                )
+        tasks_queued.send(sender=model, tasks=objs)
+        return {obj.pk: obj.curr_async_result_id for obj in objs}
+
+    def terminate(self, wait: bool = False, timeout: float | None = None) -> "dict[Any, str]":
+        """Terminate the tasks of all the instances, as `CeleryTaskModel.terminate()` does.
+
+        Statuses are resolved in bulk, the queue is scanned once to remove all queued tasks,
+        running tasks are revoked with a single control message and `local_status` is
+        written with one `bulk_update()`. `task_terminated` is sent for each instance.
+
+        Returns:
+            Dictionary pk -> new status
+
+        """
+        model = self.model
+        objs = list(self)
+        statuses = model.bulk_task_status(objs)
+        queued, running = [], []
+        ret = {}
+        for obj in objs:
+            if statuses[obj.pk] in [model.QUEUED, model.PENDING]:
+                queued.append(str(obj.curr_async_result_id))
+                ret[obj.pk] = model.CANCELED
+            elif obj.curr_async_result_id:
+                running.append(str(obj.curr_async_result_id))
+                ret[obj.pk] = model.REVOKED
+            else:
+                ret[obj.pk] = model.UNKNOWN
+
+        if queued:
+            with model.celery_app.pool.acquire(block=True) as conn:
+                client = conn.default_channel.client
+                if broker.CELERY_BOOST_QUEUE_SCRIPTS:
+                    broker.script_remove_many(client, model.celery_task_queue, model.celery_task_revoked_queue, queued)
+                else:
+                    client.sadd(model.celery_task_revoked_queue, *queued)
+                    ids = set(queued)
+                    messages = [
+                        task
+                        for __, task in broker.scan_queue(client, model.celery_task_queue)
+                        if broker.decode_headers(task).get("id") in ids
+                    ]
+                    pipe = client.pipeline(transaction=False)
+                    for task in messages:
+                        pipe.lrem(model.celery_task_queue, 1, task)
+                    pipe.execute()
+                    if broker.CELERY_BOOST_QUEUE_INDEX:
+                        broker.index_remove(client, model.celery_task_queue, *queued)
+                client.delete(*[f"celery-task-meta-{task_id}" for task_id in queued])
+        if running:
+            model.celery_app.control.revoke(running, terminate=True, signal="SIGKILL", reply=wait, timeout=timeout)
+
+        for obj in objs:
+            obj.local_status = ret[obj.pk]
+            if obj.local_status != model.REVOKED:
+                obj.curr_async_result_id = None
+            obj.clear_status_cache()
+        model._base_manager.bulk_update(objs, ["local_status", "curr_async_result_id"])
+        model._clear_coalesce_state(objs)
+        for obj in objs:
+            task_terminated.send(sender=model, task=obj)
+        return ret
+
+    def revoke(self, wait: bool = False, timeout: float | None = None) -> None:
+        """Revoke the tasks of all the instances with a single control message.
+
+        `task_revoked` is sent for each instance.
+        """
+        model = self.model
+        objs = list(self)
+        task_ids = [str(obj.curr_async_result_id) for obj in objs if obj.curr_async_result_id]
+        if task_ids:
+            model.celery_app.control.revoke(task_ids, reply=wait, timeout=timeout)
+        model._clear_coalesce_state(objs)
+        for obj in objs:
+            obj.clear_status_cache()
+            task_revoked.send(sender=model, task=obj)
+
+
+class CeleryManager(models.Manager.from_queryset(CeleryQuerySet)):  # type: ignore[misc]
     pass
 
 
@@ -106,6 +458,9 @@ class CeleryTaskModel(models.Model):
         null=True,
         help_text="Tasks with the same group key will not run in parallel",
     )
+
+    objects = CeleryManager()
+
     default_celery_task_name: str = ""
     "FQN of the task processing this Model's instances"
 
@@ -117,6 +472,74 @@ class CeleryTaskModel(models.Model):
     """Name of the queue where revoked tasks are stored.
     Only need to be specified if different from `settings.CELERY_TASK_REVOKED_QUEUE`"""
 
+    celery_status_cache_ttl: float = CELERY_BOOST_STATUS_CACHE_TTL
+    """Seconds `task_status` and `task_info` are memoized on the instance. 0 disables memoization.
+    Memoized values are discarded by `queue()`, `revoke()`, `terminate()`, `cancel()` and `refresh_from_db()`"""
+
+    celery_queue_snapshot_max_age: float = broker.CELERY_BOOST_QUEUE_SNAPSHOT_MAX_AGE
+    """Seconds a shared snapshot of the queue can be used by `is_queued()`, `queue_position`
+    and `get_queued_ids()`. Positions may be that old, or up to 30 seconds older while another process
+    rebuilds the snapshot (see `broker.snapshot_positions()`). 0 always inspects the live queue"""
+
+    celery_queue_on_commit: bool = CELERY_BOOST_QUEUE_ON_COMMIT
+    """If True `queue()` generates the task id, stores it with a single conditional UPDATE
+    and publishes the message only when the current transaction commits,
+    so that workers always find the record by `curr_async_result_id`"""
+
+    celery_group_max_parallel: int = 1
+    "Maximum number of tasks with the same `group_key` running at the same time (see `group_lease()`)"
+
+    celery_group_lease_ttl: float = 3600
+    """Seconds after which a `group_key` lease expires if not released (eg. the worker crashed).
+    Should be longer than the longest execution of the task"""
+
+    celery_group_retry_countdown: float = 10
+    "Seconds after which a task that did not get the `group_key` lease is retried"
+
+    celery_group_max_waits: int | None = None
+    """Maximum number of times a task waits for a `group_key` lease (None waits until one is free)"""
+
+    celery_queue_outbox: bool = CELERY_BOOST_QUEUE_OUTBOX
+    """If True `queue()` only stores the task id and a `TaskOutbox` entry in the current transaction, without
+    broker round-trips. Tasks are published by `TaskOutbox.objects.relay()` (see the `celery_boost_relay` command).
+    Requires `django_celery_boost.contrib.outbox` in `INSTALLED_APPS`"""
+
+    celery_queue_high_watermark: int = 0
+    """Queue size above which `queue()` applies `celery_queue_backpressure`, until the queue shrinks
+    below `celery_queue_low_watermark`. The size is read at most once every
+    `CELERY_BOOST_QUEUE_DEPTH_INTERVAL` seconds per process. 0 disables backpressure"""
+
+    celery_queue_low_watermark: int = 0
+    "Queue size below which queueing resumes. Defaults to `celery_queue_high_watermark`"
+
+    celery_queue_backpressure: str = "raise"
+    """What `queue()` does when the queue is full:
+    "raise" raises `QueueFull`, "defer" publishes the task with `celery_queue_defer_countdown`,
+    "block" waits up to `celery_queue_block_timeout` seconds and then raises `QueueFull`"""
+
+    celery_queue_defer_countdown: float = 60
+    "Seconds deferred tasks are delayed when the queue is full"
+
+    celery_queue_block_timeout: float = 30
+    "Seconds `queue()` waits for the queue to shrink when the queue is full"
+
+    celery_fan_out_task_name: str = ""
+    "FQN of the `TaskRunFromSignature` task processing the chunks created by `fan_out()`"
+
+    celery_queue_coalesce: float = 0
+    """Seconds `queue()` waits before running the task, collapsing all calls received meanwhile into one
+    execution. Calls received while the task runs schedule exactly one follow-up. 0 disables coalescing.
+    Coalesced tasks always process the latest version of the record"""
+
+    celery_coalesce_ttl: float = 3600
+    "Seconds after which the coalescing state of a record expires (eg. the worker crashed)"
+
+    celery_progress_half_life: float = 60
+    "Seconds after which a sample weighs half in the moving average of `progress_rate`"
+
+    celery_progress_sample_interval: float = 1
+    "Min seconds between two samples of `progress_rate`"
+
     _celery_app: Celery | None = None
 
     class Meta:
@@ -135,6 +558,37 @@ class CeleryTaskModel(models.Model):
     def __str__(self):
         return self.description or f"Background Job #{self.pk}"
 
+    def refresh_from_db(self, *args: Any, **kwargs: Any) -> None:
+        super().refresh_from_db(*args, **kwargs)
+        self.clear_status_cache()
+
+    def _get_cached(self, name: str) -> "tuple[bool, Any]":
+        cache = self.__dict__.get("_celery_cache")
+        if cache and cache["task_id"] == self.curr_async_result_id and name in cache:
+            expires, value = cache[name]
+            if expires > time.monotonic():
+                return True, value
+        return False, None
+
+    def _set_cached(self, name: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        cache = self.__dict__.get("_celery_cache")
+        if not cache or cache["task_id"] != self.curr_async_result_id:
+            cache = self.__dict__["_celery_cache"] = {"task_id": self.curr_async_result_id}
+        cache[name] = (time.monotonic() + ttl, value)
+
+    def _cached(self, name: str, getter: "Callable[[], Any]", ttl: float | None = None) -> Any:
+        found, value = self._get_cached(name)
+        if not found:
+            value = getter()
+            self._set_cached(name, value, self.celery_status_cache_ttl if ttl is None else ttl)
+        return value
+
+    def clear_status_cache(self) -> None:
+        """Discard memoized and prefetched task information."""
+        self.__dict__.pop("_celery_cache", None)
+
     @classproperty
     def celery_app(cls) -> "celery.app.base.Celery":  # noqa
         if not cls._celery_app:
@@ -176,6 +630,13 @@ class CeleryTaskModel(models.Model):
                             id="django_celery_boost.E003",
                         )
                     )
+        if cls.celery_queue_outbox and not apps.is_installed("django_celery_boost.contrib.outbox"):
+            errors.append(
+                checks.Error(
+                    "'%s' uses the outbox, add 'django_celery_boost.contrib.outbox' to INSTALLED_APPS" % cls._meta,
+                    id="django_celery_boost.E004",
+                )
+            )
 
         return errors
 
@@ -189,6 +650,56 @@ class CeleryTaskModel(models.Model):
         with cls.celery_app.pool.acquire(block=True) as conn:
             return int(conn.default_channel.client.llen(cls.celery_task_queue))
 
+    @classmethod
+    def get_cached_queue_size(cls) -> int:
+        """Return the queue size, reading it at most once every `CELERY_BOOST_QUEUE_DEPTH_INTERVAL` seconds."""
+        now = time.monotonic()
+        checked, size = _queue_depth.get(cls.celery_task_queue, (-math.inf, 0))
+        if now - checked >= CELERY_BOOST_QUEUE_DEPTH_INTERVAL:
+            size = cls.get_queue_size()
+            _queue_depth[cls.celery_task_queue] = (now, size)
+        return size
+
+    @classmethod
+    def is_queue_saturated(cls) -> bool:
+        """Check the queue against the watermarks.
+
+        The queue is saturated once it reaches `celery_queue_high_watermark` and stays so
+        until it shrinks below `celery_queue_low_watermark`.
+        """
+        if not cls.celery_queue_high_watermark:
+            return False
+        size = cls.get_cached_queue_size()
+        if _saturated.get(cls._meta.label_lower, False):
+            saturated = size >= (cls.celery_queue_low_watermark or cls.celery_queue_high_watermark)
+        else:
+            saturated = size >= cls.celery_queue_high_watermark
+        _saturated[cls._meta.label_lower] = saturated
+        return saturated
+
+    @classmethod
+    def _apply_backpressure(cls) -> float | None:
+        """Apply `celery_queue_backpressure` if the queue is saturated.
+
+        Returns:
+            the countdown the task must be published with
+
+        Raises:
+            QueueFull: if the queue is (still) saturated
+
+        """
+        if not cls.is_queue_saturated():
+            return None
+        if cls.celery_queue_backpressure == "defer":
+            return cls.celery_queue_defer_countdown
+        if cls.celery_queue_backpressure == "block":
+            deadline = time.monotonic() + cls.celery_queue_block_timeout
+            while time.monotonic() < deadline:
+                time.sleep(max(CELERY_BOOST_QUEUE_DEPTH_INTERVAL, 0.1))
+                if not cls.is_queue_saturated():
+                    return None
+        raise QueueFull(cls.celery_task_queue, _queue_depth[cls.celery_task_queue][1])
+
     @property
     def queue_position(self) -> int:
         """Return the position of the current task in the queue.
@@ -197,61 +708,220 @@ class CeleryTaskModel(models.Model):
             int task position in queue
 
         """
-        if self.is_terminated():
+        found, value = self._get_cached("queue_position")
+        if found:
+            return value
+        # only queued tasks have a position, the status is usually cached (see `prefetch_live_info()`)
+        if self.task_status != self.QUEUED:
             return 0
-        with self.celery_app.pool.acquire(block=True) as conn:
-            tasks = conn.default_channel.client.lrange(self.celery_task_queue, 0, -1)
-        for i, task in enumerate(reversed(tasks), 1):
-            j = json.loads(task)
-            if j["headers"]["id"] == self.curr_async_result_id:
-                return i
+        return self.get_task_position(self.curr_async_result_id)
+
+    @classmethod
+    def get_task_positions(cls, task_ids: "Iterable[str]") -> "dict[str, int]":
+        """Return the position of many tasks in the queue, scanning it at most once.
+
+        Args:
+            task_ids: ids of the tasks to look for
+
+        Returns:
+            Dictionary task id -> position (1 is the next task to be consumed) or 0 if not queued
+
+        """
+        ids = list(dict.fromkeys(str(task_id) for task_id in task_ids if task_id))
+        if not ids:
+            return {}
+        with cls.celery_app.pool.acquire(block=True) as conn:
+            client = conn.default_channel.client
+            if broker.CELERY_BOOST_QUEUE_INDEX:
+                positions = broker.index_positions(client, cls.celery_task_queue, ids)
+                if positions is None:
+                    positions = broker.try_rebuild_index(client, cls.celery_task_queue, ids)
+                if positions is not None:
+                    return dict(zip(ids, positions))
+            if cls.celery_queue_snapshot_max_age > 0:
+                positions = broker.snapshot_positions(
+                    client, cls.celery_task_queue, ids, cls.celery_queue_snapshot_max_age
+                )
+                if positions is not None:
+                    return dict(zip(ids, positions))
+            ret = dict.fromkeys(ids, 0)
+            missing = len(ids)
+            for pos, task in broker.scan_queue(client, cls.celery_task_queue, from_tail=True):
+                task_id = broker.decode_headers(task).get("id")
+                if task_id in ret:
+                    ret[task_id] = pos
+                    missing -= 1
+                    if not missing:
+                        break
+            return ret
+
+    @classmethod
+    def get_task_position(cls, task_id: str | None) -> int:
+        """Return the position of a task in the queue.
+
+        Uses the queue index when `CELERY_BOOST_QUEUE_INDEX` is enabled. If it is missing or stale
+        the queue is scanned, while the index is rebuilt at most every `CELERY_BOOST_QUEUE_INDEX_REBUILD_INTERVAL`.
+        Models with `celery_queue_snapshot_max_age` read the position from a snapshot shared by
+        all processes, that may be up to that many seconds old (plus up to 30 seconds while another
+        process rebuilds it).
+        Without index the queue is scanned server side if `CELERY_BOOST_QUEUE_SCRIPTS` is enabled.
+
+        Args:
+            task_id: the id of the task to look for
+
+        Returns:
+            int task position in queue (1 is the next task to be consumed) or 0 if not queued
+
+        """
+        if not task_id:
+            return 0
+        with cls.celery_app.pool.acquire(block=True) as conn:
+            client = conn.default_channel.client
+            if broker.CELERY_BOOST_QUEUE_INDEX:
+                position = broker.index_position(client, cls.celery_task_queue, task_id)
+                if position is not None:
+                    return position
+                positions = broker.try_rebuild_index(client, cls.celery_task_queue, [task_id])
+                if positions is not None:
+                    return positions[0]
+            if cls.celery_queue_snapshot_max_age > 0:
+                positions = broker.snapshot_positions(
+                    client, cls.celery_task_queue, [task_id], cls.celery_queue_snapshot_max_age
+                )
+                if positions is not None:
+                    return positions[0]
+            if broker.CELERY_BOOST_QUEUE_SCRIPTS:
+                return broker.script_position(client, cls.celery_task_queue, task_id)
+            for pos, task in broker.scan_queue(client, cls.celery_task_queue):
+                if broker.decode_headers(task).get("id") == task_id:
+                    return pos
         return 0
 
     @classmethod
-    def celery_queue_entries(cls) -> "Generator":
+    def celery_queue_entries(cls, window: int | None = None, from_tail: bool = False) -> "Generator":
+        """Iterate over the raw messages of the queue.
+
+        Messages are fetched in chunks of `window` entries and the iteration stops
+        fetching as soon as the caller stops consuming it.
+
+        Args:
+            window: number of messages fetched per round-trip. Defaults to `CELERY_BOOST_QUEUE_SCAN_WINDOW`
+            from_tail: start from the next message to be consumed
+
+        """
         with cls.celery_app.pool.acquire(block=True) as conn:
-            yield from conn.default_channel.client.lrange(cls.celery_task_queue, 0, -1)
+            for __, message in broker.scan_queue(conn.default_channel.client, cls.celery_task_queue, window, from_tail):
+                yield message
 
     @classmethod
-    def celery_queue_info(cls) -> "dict[str, int]":
+    def celery_queue_info(cls, oldest: bool = False, scan: bool = False) -> "dict[str, int | float | None]":
         """Return information about the queue.
 
+        Args:
+            oldest: include the age in seconds of the next task to be consumed
+            scan: count canceled tasks scanning the queue if the index is not available (see `celery_queues_info()`)
+
         Returns:
-            Dictionary with size,pending, canceled, revoked tasks
+            Dictionary with size, pending, reserved, canceled and revoked tasks
 
         """
-        conn: Connection
-        channel: Channel
+        return cls.celery_queues_info(cls.celery_task_queue, oldest=oldest, scan=scan)[cls.celery_task_queue]
+
+    @classmethod
+    def celery_queues_info(
+        cls, *queues: str, oldest: bool = False, scan: bool = False
+    ) -> "dict[str, dict[str, int | float | None]]":
+        """Return information about many queues with a single Redis round-trip.
+
+        - size: messages in the queue
+        - canceled: queued messages of tasks flagged as revoked, that workers will discard.
+          Counted with the queue index (`CELERY_BOOST_QUEUE_INDEX`), otherwise 0 unless `scan` is True
+        - pending: messages that will be executed (size - canceled)
+        - reserved: messages fetched by workers but not yet acknowledged. Counted by queue with
+          `CELERY_BOOST_QUEUE_SCRIPTS`, otherwise the total of all the queues
+        - revoked: tasks flagged as revoked (shared by all queues)
+        - oldest: (if requested) seconds since the next task to be consumed has been queued,
+          or None if unknown. The age is only available for tasks of this model.
+
+        Args:
+            *queues: names of the queues. Defaults to `celery_task_queue`
+            oldest: include the age of the next task to be consumed
+            scan: count canceled tasks scanning the queues when the index is not available.
+                The scan blocks Redis for O(queue length), do not use it for frequent polling
+
+        Returns:
+            Dictionary queue -> information
+
+        """
+        queues = queues or (cls.celery_task_queue,)
         with cls.celery_app.pool.acquire(block=True) as conn:
             channel = conn.default_channel
-            size = cls.get_queue_size()
-            revoked = list(channel.client.smembers(cls.celery_task_revoked_queue))
-            pending = size
-            canceled = 0
-
-            return {
-                "size": size,
-                "pending": pending,
-                "canceled": canceled,
-                "revoked": len(revoked),
+            revoked, stats = broker.queue_stats(
+                channel.client,
+                queues,
+                cls.celery_task_revoked_queue,
+                getattr(channel, "unacked_key", "unacked"),
+                scan=scan,
+            )
+        ret: dict[str, dict[str, int | float | None]] = {
+            queue: {
+                "size": st.size,
+                "pending": st.size - st.canceled,
+                "reserved": st.reserved,
+                "canceled": st.canceled,
+                "revoked": revoked,
             }
+            for queue, st in stats.items()
+        }
+        if oldest:
+            next_ids = {st.next_id: queue for queue, st in stats.items() if st.next_id}
+            queued_at = dict(
+                cls.objects.filter(curr_async_result_id__in=next_ids).values_list(
+                    "curr_async_result_id", "datetime_queued"
+                )
+            )
+            now = timezone.now()
+            for queue, st in stats.items():
+                dt = queued_at.get(st.next_id)
+                ret[queue]["oldest"] = (now - dt).total_seconds() if dt else None
+        return ret
 
     @property
     def async_result(self) -> "AsyncResult|None":
         """Return the AsyncResult object of the current instance."""
         if self.curr_async_result_id:
-            return self.celery_app.AsyncResult(self.curr_async_result_id)
+            return self._cached(
+                "async_result", lambda: self.celery_app.AsyncResult(self.curr_async_result_id), math.inf
+            )
         return None
 
     @property
     def queue_entry(self) -> "dict[str, Any]":
         """Return the queue entry of the current instance."""
         if self.async_result:
-            for task in self.celery_queue_entries():
-                j = json.loads(task)
-                if j["headers"]["id"] == self.async_result.id:
-                    j["body"] = json.loads(base64.b64decode(j["body"]))
-                    return j
+            task_id = self.async_result.id
+            task = None
+            if broker.CELERY_BOOST_QUEUE_INDEX:
+                position = self.get_task_position(task_id)
+                if not position:
+                    return {"id": "NotFound"}
+                with self.celery_app.pool.acquire(block=True) as conn:
+                    candidate = conn.default_channel.client.lindex(self.celery_task_queue, -position)
+                if candidate and broker.decode_headers(candidate).get("id") == task_id:
+                    task = candidate
+            elif broker.CELERY_BOOST_QUEUE_SCRIPTS:
+                with self.celery_app.pool.acquire(block=True) as conn:
+                    task = broker.script_find(conn.default_channel.client, self.celery_task_queue, task_id)
+                if not task:
+                    return {"id": "NotFound"}
+            if task is None:
+                task = next(
+                    (t for t in self.celery_queue_entries() if broker.decode_headers(t).get("id") == task_id), None
+                )
+            if task:
+                j = broker.loads(task)
+                j["body"] = broker.loads(base64.b64decode(j["body"]))
+                return j
         return {"id": "NotFound"}
 
     @property
@@ -262,6 +932,9 @@ class CeleryTaskModel(models.Model):
             Dictionary with task information
 
         """
+        return self._cached("task_info", self._get_task_info)
+
+    def _get_task_info(self) -> "dict[str, Any]":
         ret = {"status": self.task_status, "completed_at": ""}
         if self.async_result:
             info = self.async_result._get_task_meta()
@@ -301,19 +974,14 @@ class CeleryTaskModel(models.Model):
             return "="
 
     @classproperty
-    def task_handler(cls: "type[CeleryTaskModel]") -> "Callable[[Any], Any]":  # noqa
+    def task_handler(cls: "type[CeleryTaskModel]") -> "Task":  # noqa
         """Return the task assigned to this model."""
         return import_string(cls.celery_task_name)
 
     def is_queued(self) -> bool:
         """Check if the job is queued."""
         try:
-            with self.celery_app.pool.acquire(block=True) as conn:
-                tasks = conn.default_channel.client.lrange(self.celery_task_queue, 0, -1)
-            for task in tasks:
-                j = json.loads(task)
-                if j["headers"]["id"] == self.curr_async_result_id:
-                    return True
+            return self.get_task_position(self.curr_async_result_id) > 0
         except Exception as e:
             logger.exception(e)
         return False
@@ -336,6 +1004,9 @@ class CeleryTaskModel(models.Model):
     @property
     def task_status(self) -> str:
         """Return the task status querying Celery API."""
+        return self._cached("task_status", self._get_task_status)
+
+    def _get_task_status(self) -> str:
         try:
             if self.curr_async_result_id:
                 result = self.async_result.state
@@ -350,47 +1021,369 @@ class CeleryTaskModel(models.Model):
         except Exception as e:  # noqa
             return str(e)
 
+    @classmethod
+    def get_queued_ids(cls, task_ids: "Iterable[str]") -> "set[str]":
+        """Return which of `task_ids` are in the queue, scanning it at most once.
+
+        Args:
+            task_ids: ids of the tasks to look for
+
+        Returns:
+            the set of queued task ids
+
+        """
+        ids = {str(task_id) for task_id in task_ids if task_id}
+        if not ids:
+            return set()
+        with cls.celery_app.pool.acquire(block=True) as conn:
+            client = conn.default_channel.client
+            if broker.CELERY_BOOST_QUEUE_INDEX:
+                found = broker.index_members(client, cls.celery_task_queue, ids)
+                if found is not None:
+                    return found
+                ordered = list(ids)
+                positions = broker.try_rebuild_index(client, cls.celery_task_queue, ordered)
+                if positions is not None:
+                    return {task_id for task_id, pos in zip(ordered, positions) if pos}
+            if cls.celery_queue_snapshot_max_age > 0:
+                positions = broker.snapshot_positions(
+                    client, cls.celery_task_queue, ids, cls.celery_queue_snapshot_max_age
+                )
+                if positions is not None:
+                    return {task_id for task_id, pos in zip(ids, positions) if pos}
+            if broker.CELERY_BOOST_QUEUE_SCRIPTS:
+                return broker.script_filter(client, cls.celery_task_queue, ids)
+            found = set()
+            for __, task in broker.scan_queue(client, cls.celery_task_queue):
+                task_id = broker.decode_headers(task).get("id")
+                if task_id in ids:
+                    found.add(task_id)
+                    if len(found) == len(ids):
+                        break
+            return found
+
+    @classmethod
+    def get_task_states(cls, task_ids: "Iterable[str]") -> "dict[str, str]":
+        """Return the Celery state of many tasks with a single result backend round-trip.
+
+        Args:
+            task_ids: ids of the tasks
+
+        Returns:
+            Dictionary task_id -> Celery state. Unknown tasks are PENDING.
+
+        """
+        ids = [str(task_id) for task_id in task_ids]
+        if not ids:
+            return {}
+        backend = cls.celery_app.backend
+        if not isinstance(backend, BaseKeyValueStoreBackend):
+            return {task_id: cls.celery_app.AsyncResult(task_id).state for task_id in ids}
+        values = backend.mget([backend.get_key_for_task(task_id) for task_id in ids])
+        return {
+            task_id: backend.decode_result(value)["status"] if value else cls.PENDING
+            for task_id, value in zip(ids, values)
+        }
+
+    @classmethod
+    def bulk_task_status(cls, objs: "Iterable[CeleryTaskModel]") -> "dict[Any, str]":
+        """Return the task status of many instances at once.
+
+        Celery states are fetched with one result backend round-trip and
+        the queue is scanned at most once to resolve the PENDING tasks.
+
+        Args:
+            objs: instances to check
+
+        Returns:
+            Dictionary pk -> status, with the same values returned by `task_status`
+
+        """
+        objs = list(objs)
+        try:
+            states = cls.get_task_states(obj.curr_async_result_id for obj in objs if obj.curr_async_result_id)
+            pending = [task_id for task_id, state in states.items() if state == cls.PENDING]
+            queued = cls.get_queued_ids(pending)
+        except Exception as e:  # noqa
+            logger.exception(e)
+            return {obj.pk: obj.task_status for obj in objs}
+
+        ret = {}
+        for obj in objs:
+            if not obj.curr_async_result_id:
+                ret[obj.pk] = cls.NOT_SCHEDULED
+                continue
+            task_id = str(obj.curr_async_result_id)
+            status = states[task_id]
+            if status == cls.PENDING:
+                status = cls.QUEUED if task_id in queued else cls.MISSING
+            ret[obj.pk] = status
+        return ret
+
+    @classmethod
+    def prefetch_live_info(
+        cls, objs: "Iterable[CeleryTaskModel]", status: bool = True, position: bool = True, tracking: bool = True
+    ) -> None:
+        """Fetch task status, queue position and tracking data of many instances at once.
+
+        Values are attached to each instance and returned by `task_status`, `queue_position`, `get_tracking_info()`
+        and the properties based on them, until `clear_status_cache()` is called (see `celery_status_cache_ttl`).
+        Use it to render lists of instances without Redis round-trips per row.
+
+        Args:
+            objs: instances to prefetch
+            status: prefetch `task_status`. Implied by `position`
+            position: prefetch `queue_position`, that may need to scan the queue
+            tracking: prefetch the tracking data
+
+        """
+        objs = list(objs)
+        if status or position:
+            statuses = cls.bulk_task_status(objs)
+            for obj in objs:
+                obj._set_cached("task_status", statuses[obj.pk], math.inf)
+        if position:
+            positions = cls.get_task_positions(
+                obj.curr_async_result_id for obj in objs if statuses[obj.pk] == cls.QUEUED
+            )
+            for obj in objs:
+                obj._set_cached("queue_position", positions.get(str(obj.curr_async_result_id), 0), math.inf)
+        if tracking:
+            # the internal fields are kept for `get_progress_stats()`
+            data = cls._read_tracking_info_many(objs, (), internal=True)
+            for obj in objs:
+                obj._set_cached("tracking", data[obj.pk], math.inf)
+
+    @classmethod
+    def get_tracking_info_many(
+        cls, objs: "Iterable[CeleryTaskModel | str]", *fields: str
+    ) -> "dict[Any, dict[str, str] | None]":
+        """Read the tracking data of many instances or task ids in one Redis round-trip.
+
+        Args:
+            objs: instances or task ids
+            *fields: Optional field names to retrieve. If none provided, returns all fields.
+
+        Returns:
+            Dictionary of the `get_tracking_info()` value of each object, keyed by pk (or by task id).
+
+        """
+        return cls._read_tracking_info_many(objs, fields)
+
+    @classmethod
+    def _read_tracking_info_many(
+        cls, objs: "Iterable[CeleryTaskModel | str]", fields: "Sequence[str]", internal: bool = False
+    ) -> "dict[Any, dict[str, str] | None]":
+        keys = {(obj.pk if isinstance(obj, CeleryTaskModel) else obj): obj for obj in objs}
+        task_ids = {
+            key: obj.curr_async_result_id if isinstance(obj, CeleryTaskModel) else obj for key, obj in keys.items()
+        }
+        tracked = [key for key, task_id in task_ids.items() if task_id]
+        values = []
+        if tracked:
+            with cls.celery_app.pool.acquire(block=True) as conn:
+                pipe = conn.default_channel.client.pipeline(transaction=False)
+                for key in tracked:
+                    tracking_key = f"{CELERY_BOOST_TRACKING_KEY_PREFIX}:{task_ids[key]}"
+                    if fields:
+                        pipe.hmget(tracking_key, *fields)
+                    else:
+                        pipe.hgetall(tracking_key)
+                values = pipe.execute()
+        ret: dict[Any, dict[str, str] | None] = dict.fromkeys(keys)
+        for key, data in zip(tracked, values):
+            if fields:
+                data = dict(zip(fields, data))
+            ret[key] = _decode_tracking_data(data, internal) or None
+        return ret
+
     def set_queued(self, result: AsyncResult) -> None:
         with concurrency_disable_increment(self):
+            self.clear_status_cache()
             self.curr_async_result_id = result.id
             self.datetime_queued = timezone.now()
             self.save(update_fields=["curr_async_result_id", "datetime_queued"])
             task_queued.send(sender=self.__class__, task=self)
 
+    async def aset_queued(self, result: AsyncResult) -> None:
+        """Async version of `set_queued()`, saving with the async ORM."""
+        with concurrency_disable_increment(self):
+            self.clear_status_cache()
+            self.curr_async_result_id = result.id
+            self.datetime_queued = timezone.now()
+            await self.asave(update_fields=["curr_async_result_id", "datetime_queued"])
+        await sync_to_async(task_queued.send)(sender=self.__class__, task=self)
+
     def queue(self, use_version: bool = True) -> str | None:
         """Queue the record processing.
 
         use_version: if True the task fails if the record is changed after it has been queued.
+
+        Raises `QueueFull` if the queue is above `celery_queue_high_watermark` (see `celery_queue_backpressure`).
         """
+        self.clear_status_cache()
+        if self.celery_queue_coalesce:
+            return self._queue_coalesced()
+        if self.celery_queue_outbox:
+            return self._queue_outbox(use_version)
         if self.task_status not in self.ACTIVE_STATUSES:
-            res = self.task_handler.delay(self.pk, self.version if use_version else None)
+            countdown = self._apply_backpressure()
+            if self.celery_queue_on_commit:
+                return self._queue_on_commit(use_version, countdown)
+            res = self.task_handler.apply_async((self.pk, self.version if use_version else None), countdown=countdown)
             self.set_queued(res)
             return self.curr_async_result_id
         return None
 
+    def _queue_on_commit(self, use_version: bool, countdown: float | None = None) -> str | None:
+        """Store a new task id and publish the task when the transaction commits.
+
+        Returns:
+            the task id or None if the record has been queued meanwhile by someone else.
+
+        """
+        task_id = uuid()
+        now = timezone.now()
+        updated = (
+            type(self)
+            ._base_manager.filter(pk=self.pk, curr_async_result_id=self.curr_async_result_id)
+            .update(curr_async_result_id=task_id, datetime_queued=now)
+        )
+        if not updated:
+            return None
+        self.curr_async_result_id = task_id
+        self.datetime_queued = now
+        self.clear_status_cache()
+        args = (self.pk, self.version if use_version else None)
+        transaction.on_commit(lambda: self.task_handler.apply_async(args, task_id=task_id, countdown=countdown))
+        task_queued.send(sender=self.__class__, task=self)
+        return task_id
+
+    def _queue_outbox(self, use_version: bool) -> str | None:
+        """Store a new task id and the queueing request in the outbox, in the current transaction.
+
+        The task is published by `TaskOutbox.objects.relay()`, that applies the backpressure;
+        until then `task_status` is MISSING.
+
+        Returns:
+            the id the task will be published with, or None if the record has an active task.
+            Requests for a record already in the outbox share its id and the version of the last request.
+
+        """
+        from django_celery_boost.contrib.outbox.models import TaskOutbox
+
+        version = self.version if use_version else None
+        entry = TaskOutbox.objects.filter(model=self._meta.label_lower, object_pk=str(self.pk)).first()
+        if entry is not None and entry.task_id == self.curr_async_result_id:
+            if entry.version != version:
+                TaskOutbox.objects.filter(pk=entry.pk).update(version=version)
+            return entry.task_id
+        if self.task_status in self.ACTIVE_STATUSES:
+            return None
+        task_id = uuid()
+        now = timezone.now()
+        updated = (
+            type(self)
+            ._base_manager.filter(pk=self.pk, curr_async_result_id=self.curr_async_result_id)
+            .update(curr_async_result_id=task_id, datetime_queued=now)
+        )
+        if not updated:
+            return None
+        self.curr_async_result_id = task_id
+        self.datetime_queued = now
+        self.clear_status_cache()
+        TaskOutbox.objects.update_or_create(
+            model=self._meta.label_lower,
+            object_pk=str(self.pk),
+            defaults={"task_id": task_id, "version": version},
+        )
+        return task_id
+
+    def _queue_coalesced(self) -> str | None:
+        """Queue the record processing unless already queued (see `celery_queue_coalesce`).
+
+        Backpressure is applied only to the calls that publish a task.
+
+        Returns:
+            the task id or None if the call has been coalesced with a queued or running task.
+
+        """
+        key = broker.get_coalesce_key(self._meta.label_lower, self.pk)
+        with self.celery_app.pool.acquire(block=True) as conn:
+            if not broker.coalesce_request(conn.default_channel.client, key, self.celery_coalesce_ttl):
+                return None
+        try:
+            countdown = self._apply_backpressure()
+        except Exception:
+            self._clear_coalesce_state([self])
+            raise
+        return self._publish_coalesced(countdown)
+
+    def _publish_coalesced(self, countdown: float | None = None) -> str:
+        """Publish the coalesced task, resetting the coalescing state if that fails.
+
+        Otherwise `queue()` would be ignored for `celery_coalesce_ttl`.
+        """
+        try:
+            res = self.task_handler.apply_async(
+                (self.pk, None),
+                countdown=self.celery_queue_coalesce + (countdown or 0),
+                headers={COALESCE_HEADER: [self._meta.label_lower, self.pk]},
+            )
+            self.set_queued(res)
+        except Exception:
+            self._clear_coalesce_state([self])
+            raise
+        return self.curr_async_result_id
+
+    @classmethod
+    def _clear_coalesce_state(cls, objs: "Iterable[CeleryTaskModel]") -> None:
+        """Reset the coalesced queueing state of terminated or revoked records.
+
+        Revoked tasks never run the signal handlers resetting it, that would ignore `queue()` for `celery_coalesce_ttl`.
+        """
+        if not cls.celery_queue_coalesce:
+            return
+        keys = [broker.get_coalesce_key(cls._meta.label_lower, obj.pk) for obj in objs]
+        if keys:
+            with cls.celery_app.pool.acquire(block=True) as conn:
+                conn.default_channel.client.delete(*keys)
+
     def revoke(self, wait=False, timeout=None) -> None:
         if self.async_result:
             self.async_result.revoke(wait=wait, timeout=timeout)
+        self._clear_coalesce_state([self])
+        self.clear_status_cache()
         task_revoked.send(sender=self.__class__, task=self)
 
     def terminate(self, wait=False, timeout=None) -> str:
         """Revoke the task. Does not need Running workers."""
+        self.clear_status_cache()
         if self.task_status in ["QUEUED", "PENDING"]:
             with self.celery_app.pool.acquire(block=True) as conn:
-                conn.default_channel.client.sadd(
-                    self.celery_task_revoked_queue,
-                    self.curr_async_result_id,
-                    self.curr_async_result_id,
-                )
-                # removes the task from the queue
-                for task_json in self.celery_queue_entries():
-                    task = json.loads(task_json)
-                    try:
-                        if task.get("headers").get("id") == self.curr_async_result_id:  # pragma: no branch
+                if broker.CELERY_BOOST_QUEUE_SCRIPTS:
+                    # removes the task from the queue and flags it as revoked in one atomic step
+                    broker.script_remove(
+                        conn.default_channel.client,
+                        self.celery_task_queue,
+                        self.celery_task_revoked_queue,
+                        self.curr_async_result_id,
+                    )
+                else:
+                    conn.default_channel.client.sadd(
+                        self.celery_task_revoked_queue,
+                        self.curr_async_result_id,
+                        self.curr_async_result_id,
+                    )
+                    # removes the task from the queue
+                    for task_json in self.celery_queue_entries():
+                        if broker.decode_headers(task_json).get("id") == self.curr_async_result_id:
                             conn.default_channel.client.lrem(self.celery_task_queue, 1, task_json)
                             break
-                    except AttributeError:  # pragma: no cover
-                        pass
+                    if broker.CELERY_BOOST_QUEUE_INDEX:
+                        broker.index_remove(
+                            conn.default_channel.client, self.celery_task_queue, self.curr_async_result_id
+                        )
                 conn.default_channel.client.delete(f"celery-task-meta-{self.curr_async_result_id}")
             self.curr_async_result_id = None
             st = self.CANCELED
@@ -402,10 +1395,97 @@ class CeleryTaskModel(models.Model):
             st = self.UNKNOWN
 
         self.local_status = st
+        self.clear_status_cache()
         self.save(update_fields=["local_status", "curr_async_result_id"])
+        self._clear_coalesce_state([self])
         task_terminated.send(sender=self.__class__, task=self)
         return st
 
+    async def atask_status(self) -> str:
+        """Async version of `task_status`, using `redis.asyncio` clients."""
+        found, value = self._get_cached("task_status")
+        if found:
+            return value
+        try:
+            if not self.curr_async_result_id:
+                return self.NOT_SCHEDULED
+            result = await aio.get_task_state(self.celery_app, self.curr_async_result_id)
+            if result == self.PENDING:
+                client = aio.get_broker_client(self.celery_app)
+                position = await aio.task_position(client, self.celery_task_queue, self.curr_async_result_id)
+                result = self.QUEUED if position else self.MISSING
+        except Exception as e:  # noqa
+            return str(e)
+        self._set_cached("task_status", result, self.celery_status_cache_ttl)
+        return result
+
+    async def aget_tracking_info(self, *fields: str) -> dict | None:
+        """Async version of `get_tracking_info()`."""
+        if not self.curr_async_result_id:
+            return None
+        found, data = self._get_cached("tracking")
+        if found:
+            return _select_tracking_data(data or {}, fields) or None
+        client = aio.get_broker_client(self.celery_app)
+        if fields:
+            values = await client.hmget(self._get_tracking_key(), *fields)
+            if not any(values):
+                return None
+            data = dict(zip(fields, values))
+        else:
+            data = await client.hgetall(self._get_tracking_key())
+            if not data:
+                return None
+        return _decode_tracking_data(data)
+
+    async def aqueue(self, use_version: bool = True) -> str | None:
+        """Async version of `queue()`.
+
+        The status is checked without blocking and the record is saved with the async ORM,
+        while messages are published by kombu in a thread.
+        """
+        self.clear_status_cache()
+        if self.celery_queue_coalesce or self.celery_queue_outbox or self.celery_queue_on_commit:
+            return await sync_to_async(self.queue)(use_version)
+        if await self.atask_status() not in self.ACTIVE_STATUSES:
+            # "block" backpressure waits in a thread, not blocking the event loop
+            countdown = await sync_to_async(self._apply_backpressure, thread_sensitive=False)()
+            res = await sync_to_async(self.task_handler.apply_async)(
+                (self.pk, self.version if use_version else None), countdown=countdown
+            )
+            await self.aset_queued(res)
+            return self.curr_async_result_id
+        return None
+
+    async def aterminate(self, wait: bool = False, timeout: float | None = None) -> str:
+        """Async version of `terminate()`."""
+        self.clear_status_cache()
+        if await self.atask_status() in [self.QUEUED, self.PENDING]:
+            client = aio.get_broker_client(self.celery_app)
+            await aio.remove_task(
+                client, self.celery_task_queue, self.celery_task_revoked_queue, self.curr_async_result_id
+            )
+            await client.delete(f"celery-task-meta-{self.curr_async_result_id}")
+            self.curr_async_result_id = None
+            st = self.CANCELED
+        elif self.curr_async_result_id:
+            await sync_to_async(self.celery_app.control.revoke)(
+                self.curr_async_result_id, terminate=True, signal="SIGKILL", reply=wait, timeout=timeout
+            )
+            st = self.REVOKED
+        else:
+            st = self.UNKNOWN
+
+        self.local_status = st
+        self.clear_status_cache()
+        await self.asave(update_fields=["local_status", "curr_async_result_id"])
+        if self.celery_queue_coalesce:
+            await aio.get_broker_client(self.celery_app).delete(
+                broker.get_coalesce_key(self._meta.label_lower, self.pk)
+            )
+        await sync_to_async(task_terminated.send)(sender=self.__class__, task=self)
+        return st
+
     def _get_tracking_key(self) -> str:
         """Return the Redis key for tracking data."""
         return f"{CELERY_BOOST_TRACKING_KEY_PREFIX}:{self.curr_async_result_id}"
@@ -423,8 +1503,11 @@ class CeleryTaskModel(models.Model):
         with self.celery_app.pool.acquire(block=True) as conn:
             client = conn.default_channel.client
             key = self._get_tracking_key()
-            client.hset(key, field, value)
-            client.expire(key, CELERY_BOOST_TRACKING_TTL)
+            pipe = client.pipeline(transaction=False)
+            pipe.hset(key, field, value)
+            pipe.expire(key, CELERY_BOOST_TRACKING_TTL)
+            _publish_tracking(pipe, self.curr_async_result_id, {field: str(value)})
+            pipe.execute()
 
     def set_total(self, value: str | int) -> None:
         """Set the total count for progress tracking."""
@@ -432,7 +1515,54 @@ class CeleryTaskModel(models.Model):
 
     def set_progress(self, value: str | int) -> None:
         """Set the current progress count for progress tracking."""
-        self.set_tracking_info("progress", str(value))
+        self._write_progress(str(value))
+
+    def _track_progress(self, client: Any, value: str | int, incr: bool = False) -> Any:
+        """Write the progress count with `client` or a pipeline, sampling `progress_rate`."""
+        return broker.track_progress(
+            client,
+            self._get_tracking_key(),
+            value,
+            incr,
+            CELERY_BOOST_TRACKING_TTL,
+            self.celery_progress_half_life,
+            self.celery_progress_sample_interval,
+        )
+
+    def _write_progress(self, value: str | int, incr: bool = False) -> "dict[str, str]":
+        if not self.curr_async_result_id:
+            return {}
+        with self.celery_app.pool.acquire(block=True) as conn:
+            client = conn.default_channel.client
+            data = _decode_progress(self._track_progress(client, value, incr))
+            _publish_tracking(client, self.curr_async_result_id, data)
+        return data
+
+    def progress_reporter(self, interval: float = 0.5, max_updates: int = 1000) -> "ProgressReporter":
+        """Return a buffered writer of tracking data, to report progress from tight loops.
+
+            with job.progress_reporter() as reporter:
+                reporter.set_total(len(rows))
+                for row in rows:
+                    ...
+                    reporter.incr_progress()
+
+        Args:
+            interval: seconds after which buffered updates are written
+            max_updates: number of updates after which buffered updates are written
+
+        """
+        return ProgressReporter(self, interval=interval, max_updates=max_updates)
+
+    def incr_progress(self, amount: int = 1) -> int:
+        """Atomically increment the progress count, so that parallel tasks can share it.
+
+        Returns:
+            the new progress count
+
+        """
+        data = self._write_progress(amount, incr=True)
+        return int(data.get("progress", 0))
 
     def get_tracking_info(self, *fields: str) -> dict | None:
         """Read tracking data from Redis hash.
@@ -443,9 +1573,16 @@ class CeleryTaskModel(models.Model):
         Returns:
             Dictionary with tracking data or None if not found.
         """
+        return self._read_tracking_info(fields)
+
+    def _read_tracking_info(self, fields: "Sequence[str]", internal: bool = False) -> dict | None:
         if not self.curr_async_result_id:
             return None
 
+        found, data = self._get_cached("tracking")
+        if found:
+            return _select_tracking_data(data or {}, fields, internal) or None
+
         with self.celery_app.pool.acquire(block=True) as conn:
             client = conn.default_channel.client
             key = self._get_tracking_key()
@@ -462,12 +1599,7 @@ class CeleryTaskModel(models.Model):
                 if not data:
                     return None
 
-            # Decode bytes to strings if needed (Redis returns bytes)
-            return {
-                (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
-                for k, v in data.items()
-                if v is not None
-            }
+            return _decode_tracking_data(data, internal)
 
     @property
     def tracking_info(self) -> dict | None:
@@ -484,6 +1616,44 @@ class CeleryTaskModel(models.Model):
             return f"{progress}/{total}"
         return "Unknown"
 
+    def get_progress_stats(self) -> ProgressStats | None:
+        """Return progress, total, rate, elapsed time and ETA, with a single read of the tracking data.
+
+        The rate (items/sec) is a moving average sampled by `set_progress()` and `incr_progress()`
+        (see `celery_progress_half_life`), the elapsed time starts at the first progress update.
+        """
+        data = self._read_tracking_info(("progress", "total", "rate", PROGRESS_STARTED_FIELD), internal=True)
+        if not data:
+            return None
+        rate = float(data["rate"]) if "rate" in data else None
+        started = data.get(PROGRESS_STARTED_FIELD)
+        elapsed = timedelta(seconds=max(time.time() - float(started), 0)) if started else None
+        eta = None
+        if rate and rate > 0 and "total" in data and "progress" in data:
+            try:
+                eta = timedelta(seconds=max(float(data["total"]) - float(data["progress"]), 0) / rate)
+            except ValueError:
+                pass
+        return ProgressStats(data.get("progress"), data.get("total"), rate, elapsed, eta)
+
+    @property
+    def progress_rate(self) -> float | None:
+        """Get items processed per second, as a moving average."""
+        stats = self.get_progress_stats()
+        return stats.rate if stats else None
+
+    @property
+    def progress_elapsed(self) -> timedelta | None:
+        """Get the time elapsed since the first progress update."""
+        stats = self.get_progress_stats()
+        return stats.elapsed if stats else None
+
+    @property
+    def progress_eta(self) -> timedelta | None:
+        """Get the estimated time to complete, from `total`, `progress` and `progress_rate`."""
+        stats = self.get_progress_stats()
+        return stats.eta if stats else None
+
     def clear_tracking_info(self) -> None:
         """Remove tracking data from Redis."""
         if not self.curr_async_result_id:
@@ -497,7 +1667,8 @@ class CeleryTaskModel(models.Model):
     def request_cancellation(self) -> bool:
         """Request cooperative cancellation of a running task.
 
-        Sets a flag in Redis that the task can check via `is_termination_requested`.
+        Sets a flag in Redis that the task can check via `is_termination_requested` or a `cancellation_token()`,
+        and publishes it to the tokens listening for it.
         The task must cooperatively check this flag and stop execution.
 
         Returns:
@@ -506,9 +1677,31 @@ class CeleryTaskModel(models.Model):
         if not self.curr_async_result_id:
             return False
 
-        self.set_tracking_info("terminate_requested", "1")
+        with self.celery_app.pool.acquire(block=True) as conn:
+            key = self._get_tracking_key()
+            pipe = conn.default_channel.client.pipeline(transaction=False)
+            pipe.hset(key, "terminate_requested", "1")
+            pipe.expire(key, CELERY_BOOST_TRACKING_TTL)
+            _publish_tracking(pipe, self.curr_async_result_id, {"terminate_requested": "1"}, always=True)
+            pipe.execute()
         return True
 
+    def cancellation_token(self, interval: float = 0.5, push: bool = False) -> CancellationToken:
+        """Return a token to check cancellation requests from tight loops.
+
+            with job.cancellation_token(push=True) as cancelled:
+                for row in rows:
+                    if cancelled:
+                        break
+                    ...
+
+        Args:
+            interval: seconds between two reads of the cancellation flag
+            push: receive cancellation requests from a Redis subscription instead of reading the flag
+
+        """
+        return CancellationToken(self, interval=interval, push=push)
+
     @property
     def is_termination_requested(self) -> bool:
         """Check if cancellation was requested via `request_cancellation()`.
@@ -536,6 +1729,84 @@ class CeleryTaskModel(models.Model):
     def s(self) -> Signature:
         return self.signature()
 
+    @classmethod
+    def iter_signatures(
+        cls, queryset: "models.QuerySet | None" = None, chunk_size: int = 2000
+    ) -> "Iterator[list[Signature]]":
+        """Yield the signatures of many records in chunks, without loading model instances.
+
+        Only `pk` and `version` are read, streaming the queryset, and the task is resolved once.
+
+            for chunk in Job.iter_signatures(Job.objects.filter(...)):
+                group(chunk).apply_async()
+
+        Args:
+            queryset: records to build the signatures for. Defaults to all records
+            chunk_size: number of signatures per chunk
+
+        Yields:
+            lists of signatures, the same returned by `signature()`
+
+        """
+        task = cls.task_handler
+        if not isinstance(task, TaskRunFromSignature):
+            raise InvalidTaskBase(str(cls.celery_task_name))
+        qs = cls.objects.all() if queryset is None else queryset
+        chunk = []
+        for pk, version in qs.values_list("pk", "version").iterator(chunk_size=chunk_size):
+            chunk.append(
+                task.signature((pk, version), {APP_LABEL: cls._meta.app_label, MODEL_NAME: cls._meta.model_name})
+            )
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def fan_out(
+        self, items: "Sequence[Any]", chunks: int, callback: Signature | None = None, task_name: str | None = None
+    ) -> Signature:
+        """Split `items` in `chunks` slices to be processed in parallel.
+
+        Each slice is processed by `celery_fan_out_task_name` (a `TaskRunFromSignature` task) called with
+        `(pk, version, chunk)`. Tracking `total` is set to the number of items and `progress` reset,
+        chunks should update it with a `progress_reporter()` and stop if `is_termination_requested`,
+        as they share the tracking data of the record. Chunks do not change `curr_async_result_id`.
+
+        Use it in the task processing the record to replace itself, so that its result waits for all chunks:
+
+            raise self.replace(job.fan_out(rows, chunks=8))
+
+        Args:
+            items: the work to split
+            chunks: number of slices
+            callback: signature called with the list of chunk results. If None a group is returned
+            task_name: FQN of the task processing a slice. Defaults to `celery_fan_out_task_name`
+
+        Returns:
+            a chord, or a group if no callback is given
+
+        Raises:
+            ValueError: if `chunks` is not positive
+
+        """
+        if chunks <= 0:
+            raise ValueError(f"chunks must be positive, got {chunks}")
+        task = import_string(task_name or self.celery_fan_out_task_name)
+        if not isinstance(task, TaskRunFromSignature):
+            raise InvalidTaskBase(task.name)
+        size = math.ceil(len(items) / chunks) if items else 1
+        kwargs = {APP_LABEL: self._meta.app_label, MODEL_NAME: self._meta.model_name, FAN_OUT: True}
+        signatures = [
+            task.signature((list(items[i : i + size]), self.pk, self.version), kwargs)
+            for i in range(0, len(items), size)
+        ]
+        self.set_total(len(items))
+        self.set_progress(0)
+        if callback is None:
+            return group(signatures)
+        return chord(signatures, callback)
+
     @classmethod
     def discard_all(cls: "type[CeleryTaskModel]") -> None:
         cls.celery_app.control.discard_all()
@@ -548,6 +1819,11 @@ class CeleryTaskModel(models.Model):
         with cls.celery_app.pool.acquire(block=True) as conn:
             conn.default_channel.client.delete(cls.celery_task_queue)
             conn.default_channel.client.delete(cls.celery_task_revoked_queue)
+            conn.default_channel.client.delete(
+                broker.get_index_key(cls.celery_task_queue),
+                broker.get_index_sequence_key(cls.celery_task_queue),
+                broker.get_index_rebuilt_key(cls.celery_task_queue),
+            )
 
     @classmethod
     def get_current(cls) -> "CeleryTaskModel | None":
@@ -559,6 +1835,64 @@ class CeleryTaskModel(models.Model):
 
         return cls.objects.filter(curr_async_result_id=current_task.request.id).first()
 
+    @contextmanager
+    def group_lease(self, task: "Task") -> Iterator[None]:
+        """Enforce `celery_group_max_parallel` for the tasks with the same `group_key`.
+
+        To be used by the task processing the record. If the lease cannot be acquired the task
+        is retried after `celery_group_retry_countdown` seconds, so no worker slot is blocked.
+        Waits are limited by `celery_group_max_waits` and do not count towards the task `max_retries`.
+
+            @shared_task(bind=True)
+            def process_job(self, pk, version=None):
+                job = Job.objects.get(pk=pk)
+                with job.group_lease(self):
+                    ...
+
+        Args:
+            task: the bound task processing the record
+
+        Raises:
+            celery.exceptions.Retry: if the group has no free lease
+
+        """
+        if not self.group_key:
+            yield
+            return
+        token = task.request.id or uuid()
+        with self.celery_app.pool.acquire(block=True) as conn:
+            acquired = broker.lease_acquire(
+                conn.default_channel.client,
+                self.group_key,
+                token,
+                self.celery_group_max_parallel,
+                self.celery_group_lease_ttl,
+            )
+        if not acquired:
+            raise self._wait_group_lease(task)
+        try:
+            yield
+        finally:
+            with self.celery_app.pool.acquire(block=True) as conn:
+                broker.lease_release(conn.default_channel.client, self.group_key, token)
+
+    def _wait_group_lease(self, task: "Task") -> Retry:
+        """Re-deliver `task` as `task.retry()` does, without increasing its retries count."""
+        request = task.request
+        waits = (request.headers or {}).get(GROUP_WAITS_HEADER) or getattr(request, GROUP_WAITS_HEADER, None) or 0
+        if self.celery_group_max_waits is not None and waits >= self.celery_group_max_waits:
+            raise MaxRetriesExceededError(f"{task.name}[{request.id}] waited {waits} times for group {self.group_key}")
+        sig = task.signature_from_request(
+            request,
+            countdown=self.celery_group_retry_countdown,
+            retries=request.retries,
+            headers={**(request.headers or {}), GROUP_WAITS_HEADER: waits + 1},
+        )
+        if not request.is_eager:
+            # eager tasks are applied again by `Task.apply()`
+            sig.apply_async()
+        return Retry(when=self.celery_group_retry_countdown, is_eager=request.is_eager, sig=sig)
+
     def cancel(self) -> None:
         """Mark the task as cancelled and clean up tracking data.
 
@@ -569,6 +1903,7 @@ class CeleryTaskModel(models.Model):
             self.local_status = self.CANCELED
             self.save(update_fields=["local_status"])
             self.clear_tracking_info()
+            self.clear_status_cache()
             task_canceled.send(sender=self.__class__, task=self)
 
 
@@ -601,3 +1936,40 @@ class AsyncJobModel(CeleryTaskModel):
             if sid:
                 self.sentry_id = sid
                 self.save(update_fields=["sentry_id"])
+
+
+@celery_signals.task_prerun.connect
+def coalesced_task_started(sender: Any = None, task: "Task | None" = None, **kwargs: Any) -> None:
+    header = getattr(getattr(task, "request", None), COALESCE_HEADER, None)
+    if not header:
+        return
+    try:
+        model = cast(type[CeleryTaskModel], apps.get_model(header[0]))
+        with model.celery_app.pool.acquire(block=True) as conn:
+            broker.coalesce_start(
+                conn.default_channel.client, broker.get_coalesce_key(*header), model.celery_coalesce_ttl
+            )
+    except Exception as e:  # noqa
+        logger.exception(e)
+
+
+@celery_signals.task_postrun.connect
+def coalesced_task_finished(
+    sender: Any = None, task: "Task | None" = None, state: str | None = None, **kwargs: Any
+) -> None:
+    header = getattr(getattr(task, "request", None), COALESCE_HEADER, None)
+    if not header:
+        return
+    try:
+        model = cast(type[CeleryTaskModel], apps.get_model(header[0]))
+        with model.celery_app.pool.acquire(block=True) as conn:
+            follow_up = broker.coalesce_finish(
+                conn.default_channel.client,
+                broker.get_coalesce_key(*header),
+                model.celery_coalesce_ttl,
+                retry=state == states.RETRY,
+            )
+        if follow_up:
+            model.objects.get(pk=header[1])._publish_coalesced()
+    except Exception as e:  # noqa
+        logger.exception(e)
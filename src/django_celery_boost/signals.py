@@ -2,6 +2,7 @@ from django.dispatch import Signal
 
 # actions
 task_queued = Signal()
+tasks_queued = Signal()  # sent by CeleryQuerySet.bulk_queue() with the list of queued `tasks`
 task_revoked = Signal()
 task_terminated = Signal()
 task_canceled = Signal()
@@ -1,24 +1,120 @@
-from typing import Any, Protocol, cast
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Iterator, Protocol, cast
 
-from celery import Task
+from celery import Signature, Task
 from celery.result import EagerResult, AsyncResult
 from django.apps import apps
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from django_celery_boost.models import CeleryTaskModel
 
 
 class ApplyCallable(Protocol):
     def __call__(self, *args: Any, **kwargs: Any) -> AsyncResult: ...
 
 
+class _Batch:
+    """Records resolved in advance and results to store, see `batch_apply()`."""
+
+    def __init__(self) -> None:
+        self.records: dict[tuple[str, str], dict[Any, "CeleryTaskModel"]] = {}
+        self.queued: list[tuple["CeleryTaskModel", AsyncResult]] = []
+
+    def get(self, model_class: "type[CeleryTaskModel]", pk: Any, version: Any) -> "CeleryTaskModel":
+        records = self.records.setdefault((model_class._meta.app_label, str(model_class._meta.model_name)), {})
+        if str(pk) not in records:
+            records[str(pk)] = model_class.objects.get(pk=pk)
+        model = records[str(pk)]
+        if model.version != version:
+            raise model_class.DoesNotExist(f"{model_class.__name__} matching query does not exist.")
+        return model
+
+
+_batch: ContextVar[_Batch | None] = ContextVar("celery_boost_batch", default=None)
+
+
+def _iter_signatures(canvas: Any) -> Iterator[Signature]:
+    """Yield the signatures of a canvas, including group, chord and chain members."""
+    if isinstance(canvas, (list, tuple)):
+        for item in canvas:
+            yield from _iter_signatures(item)
+        return
+    tasks = getattr(canvas, "tasks", None)
+    if tasks is not None:
+        yield from _iter_signatures(tasks)
+        body = getattr(canvas, "body", None)
+        if body is not None:
+            yield from _iter_signatures(body)
+        return
+    if isinstance(canvas, Signature):
+        yield canvas
+
+
+@contextmanager
+def batch_apply(*canvases: Any) -> Iterator[None]:
+    """Resolve records and store results in bulk while applying canvases of `TaskRunFromSignature` tasks.
+
+    Records of the signatures in `canvases` are loaded with one query per model and
+    `curr_async_result_id`/`datetime_queued` of all the applied tasks are written with one
+    `bulk_update()` per model on exit, followed by a single `tasks_queued` signal.
+
+        with batch_apply(canvas):
+            canvas.apply_async()
+
+    Args:
+        *canvases: signatures, groups, chords or chains to resolve in advance
+
+    """
+    from django_celery_boost.models import APP_LABEL, MODEL_NAME
+    from django_celery_boost.signals import tasks_queued
+
+    batch = _Batch()
+    pks: dict[tuple[str, str], set[Any]] = {}
+    for sig in _iter_signatures(canvases):
+        kwargs = sig.kwargs or {}
+        if APP_LABEL in kwargs and MODEL_NAME in kwargs and len(sig.args) >= 2:
+            pks.setdefault((kwargs[APP_LABEL], kwargs[MODEL_NAME]), set()).add(sig.args[-2])
+    for (app_label, model_name), ids in pks.items():
+        model_class = apps.get_model(app_label, model_name)
+        batch.records[(app_label, model_name)] = {
+            str(pk): obj for pk, obj in model_class.objects.in_bulk(list(ids)).items()
+        }
+
+    token = _batch.set(batch)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+        by_model: dict[type, list["CeleryTaskModel"]] = {}
+        now = timezone.now()
+        for model, result in batch.queued:
+            model.curr_async_result_id = result.id
+            model.datetime_queued = now
+            model.clear_status_cache()
+            by_model.setdefault(type(model), []).append(model)
+        for model_class, objs in by_model.items():
+            model_class._base_manager.bulk_update(objs, ["curr_async_result_id", "datetime_queued"])
+            tasks_queued.send(sender=model_class, tasks=objs)
+
+
 def _apply(apply_method: ApplyCallable, *args: Any, **kwargs: Any) -> AsyncResult:
-    from django_celery_boost.models import APP_LABEL, MODEL_NAME, CeleryTaskModel
+    from django_celery_boost.models import APP_LABEL, FAN_OUT, MODEL_NAME, CeleryTaskModel
 
     task_args = args[0]
     pk, version = task_args[-2], task_args[-1]
     task_kwargs = args[1]
     app_label, model_name = task_kwargs[APP_LABEL], task_kwargs[MODEL_NAME]
+    # chunks of a fan-out must not replace the task of the record
+    fan_out = task_kwargs.get(FAN_OUT, False)
 
     model_class = cast(type[CeleryTaskModel], apps.get_model(app_label, model_name))
-    model = model_class.objects.get(pk=pk, version=version)
+    batch = _batch.get()
+    if batch is not None:
+        model = batch.get(model_class, pk, version)
+    else:
+        model = model_class.objects.get(pk=pk, version=version)
 
     # we want pk and version to always come first
     new_task_args = task_args[-2:] + task_args[:-2]
@@ -30,7 +126,11 @@ def _apply(apply_method: ApplyCallable, *args: Any, **kwargs: Any) -> AsyncResul
 
     new_args: tuple[Any, ...] = (new_task_args, new_task_kwargs) + args[2:]
     result = apply_method(*new_args, **kwargs)
-    model.set_queued(result)
+    if not fan_out:
+        if batch is not None:
+            batch.queued.append((model, result))
+        else:
+            model.set_queued(result)
     return result
 
 
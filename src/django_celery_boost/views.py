@@ -0,0 +1,90 @@
+"""Server-Sent Events endpoint streaming the tracking data of running tasks.
+
+The view is not routed by default, add it to your urls:
+
+    path("tasks/events/", tracking_events)
+
+Clients subscribe to many tasks at once with `?task=<id>&task=<id>`. Only staff users are allowed
+by default, set `CELERY_BOOST_TRACKING_EVENTS_PERMISSION` to the dotted path of a function
+`(request, task_ids) -> bool` (or a coroutine function) to check the ownership of the tasks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+from typing import AsyncIterator, Sequence
+
+from celery import current_app
+from django.conf import settings
+from django.http import HttpRequest, HttpResponseBadRequest, HttpResponseForbidden, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.module_loading import import_string
+
+from django_celery_boost import aio
+from django_celery_boost.models import CELERY_BOOST_TRACKING_KEY_PREFIX, _decode_tracking_data
+
+CELERY_BOOST_TRACKING_EVENTS_MAX_TASKS = getattr(settings, "CELERY_BOOST_TRACKING_EVENTS_MAX_TASKS", 500)
+CELERY_BOOST_TRACKING_EVENTS_PING = getattr(settings, "CELERY_BOOST_TRACKING_EVENTS_PING", 15)
+CELERY_BOOST_TRACKING_EVENTS_PERMISSION = getattr(
+    settings, "CELERY_BOOST_TRACKING_EVENTS_PERMISSION", "django_celery_boost.views.is_staff"
+)
+
+
+async def is_staff(request: HttpRequest, task_ids: Sequence[str]) -> bool:
+    """Allow active staff users (the default `CELERY_BOOST_TRACKING_EVENTS_PERMISSION`)."""
+    auser = getattr(request, "auser", None)
+    if auser is None:
+        return False
+    user = await auser()
+    return bool(user.is_active and user.is_staff)
+
+
+async def _has_permission(request: HttpRequest, task_ids: Sequence[str]) -> bool:
+    allowed = import_string(CELERY_BOOST_TRACKING_EVENTS_PERMISSION)(request, task_ids)
+    if inspect.isawaitable(allowed):
+        allowed = await allowed
+    return bool(allowed)
+
+
+def _event(task_id: str, data: dict[str, str]) -> str:
+    return f"event: tracking\ndata: {json.dumps({'task': task_id, 'data': data})}\n\n"
+
+
+async def _stream(task_ids: Sequence[str]) -> AsyncIterator[str]:
+    async with aio.get_tracking_hub(current_app).listen(task_ids) as queue:
+        # subscribe first, so that changes made while reading the current values are not lost
+        async with aio.get_broker_client(current_app).pipeline(transaction=False) as pipe:
+            for task_id in task_ids:
+                pipe.hgetall(f"{CELERY_BOOST_TRACKING_KEY_PREFIX}:{task_id}")
+            current = await pipe.execute()
+        for task_id, data in zip(task_ids, current):
+            if data:
+                yield _event(task_id, _decode_tracking_data(data))
+        while True:
+            try:
+                task_id, data = await asyncio.wait_for(queue.get(), CELERY_BOOST_TRACKING_EVENTS_PING)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield _event(task_id, data)
+
+
+async def tracking_events(request: HttpRequest) -> HttpResponseBase:
+    """Stream the tracking data of the tasks in the `task` query parameters.
+
+    The current values of each task are sent first, then each change published by the workers
+    (see `CELERY_BOOST_TRACKING_PUBLISH`). All the connections served by the same event loop
+    share one Redis subscription. Requests are checked by `CELERY_BOOST_TRACKING_EVENTS_PERMISSION`.
+    """
+    task_ids = list(dict.fromkeys(request.GET.getlist("task")))
+    if not task_ids or len(task_ids) > CELERY_BOOST_TRACKING_EVENTS_MAX_TASKS:
+        return HttpResponseBadRequest()
+    if not await _has_permission(request, task_ids):
+        return HttpResponseForbidden()
+    return StreamingHttpResponse(
+        _stream(task_ids),
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,82 @@
+"""Micro-benchmark of the header-only decoder against a full `json.loads`.
+
+Run with::
+
+    python tests/benchmarks/decoder.py
+"""
+
+import base64
+import json
+import sys
+import timeit
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+settings.configure()
+
+from django_celery_boost import broker  # noqa: E402
+
+SIZES = (2_000, 10_000, 50_000)
+NUMBER = 5_000
+
+
+def make_message(size: int) -> bytes:
+    """Return a Redis message shaped as kombu stores a Celery task with a `size` bytes payload."""
+    task_id = str(uuid.uuid4())
+    body = json.dumps([[1, 1], {"payload": "x" * size}, {"callbacks": None, "errbacks": None, "chain": None}])
+    return json.dumps(
+        {
+            "body": base64.b64encode(body.encode()).decode(),
+            "content-encoding": "utf-8",
+            "content-type": "application/json",
+            "headers": {
+                "lang": "py",
+                "task": "demo.tasks.process_job",
+                "id": task_id,
+                "shadow": None,
+                "eta": None,
+                "expires": None,
+                "group": None,
+                "group_index": None,
+                "retries": 0,
+                "timelimit": [None, None],
+                "root_id": task_id,
+                "parent_id": None,
+                "argsrepr": "(1, 1)",
+                "kwargsrepr": "{'payload': '...'}",
+                "origin": "gen1@localhost",
+                "ignore_result": False,
+            },
+            "properties": {
+                "correlation_id": task_id,
+                "reply_to": str(uuid.uuid4()),
+                "delivery_mode": 2,
+                "delivery_info": {"exchange": "", "routing_key": "celery"},
+                "priority": 0,
+                "body_encoding": "base64",
+                "delivery_tag": str(uuid.uuid4()),
+            },
+        }
+    ).encode()
+
+
+def main() -> None:
+    candidates = {
+        "json.loads": lambda m: json.loads(m)["headers"]["id"],
+        "broker.loads": lambda m: broker.loads(m)["headers"]["id"],
+        "broker.decode_message_info": lambda m: broker.decode_message_info(m).id,
+    }
+    print(f"orjson installed: {broker.orjson is not None}")
+    for size in SIZES:
+        message = make_message(size)
+        print(f"\n{len(message):>7} bytes message")
+        for name, func in candidates.items():
+            elapsed = timeit.timeit(lambda: func(message), number=NUMBER)
+            print(f"    {name:<28} {elapsed / NUMBER * 1_000_000:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
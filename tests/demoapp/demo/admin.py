@@ -6,4 +6,4 @@ from django_celery_boost.admin import CeleryTaskModelAdmin
 
 @admin.register(Job)
 class JobAdmin(CeleryTaskModelAdmin, admin.ModelAdmin):
-    list_display = ("__str__", "queue_position", "task_status")
+    list_display = ("__str__", "queue_position", "task_status", "progress_info", "progress_stats_info")
@@ -21,6 +21,7 @@ class Job(CeleryTaskModel, models.Model):
     value = models.IntegerField(default=0)
 
     celery_task_name = "demo.tasks.process_job"
+    celery_fan_out_task_name = "demo.tasks.process_chunk"
 
     class Meta(CeleryTaskModel.Meta):
         verbose_name = "Job"
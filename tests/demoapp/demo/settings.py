@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "admin_extra_buttons",
     "django_celery_boost",
+    "django_celery_boost.contrib.outbox",
     "demo.apps.Config",
 ]
 
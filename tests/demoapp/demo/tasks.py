@@ -16,28 +16,29 @@ def process_job(self, pk, version=None):
     if version and job.version != version:
         raise RecordModifiedError(f"Unexpected version {version}. It should be {job.version}", target=job)
 
-    if job.op == "upper":
-        job.name = job.name.upper()
-    elif job.op == "progress":
-        for i in range(1, job.value):
-            self.update_state(state="PROGRESS", meta={"current": i})
-            time.sleep(0.5)
-    elif job.op == "loop":
-        start = time.time()
-        for _ in range(job.value):
-            time.sleep(1)
-        elapsed = time.time() - start
-        return {"loops": job.value, "elapsed": elapsed}
-
-    elif job.op == "sleep":
-        time.sleep(job.value)
-
-    elif job.op == "raise":
-        raise Exception(job.name)
-    else:
-        raise Exception("Unknown {op}")
-    job.save()
-    return job.name
+    with job.group_lease(self):
+        if job.op == "upper":
+            job.name = job.name.upper()
+        elif job.op == "progress":
+            for i in range(1, job.value):
+                self.update_state(state="PROGRESS", meta={"current": i})
+                time.sleep(0.5)
+        elif job.op == "loop":
+            start = time.time()
+            for _ in range(job.value):
+                time.sleep(1)
+            elapsed = time.time() - start
+            return {"loops": job.value, "elapsed": elapsed}
+
+        elif job.op == "sleep":
+            time.sleep(job.value)
+
+        elif job.op == "raise":
+            raise Exception(job.name)
+        else:
+            raise Exception("Unknown {op}")
+        job.save()
+        return job.name
 
 
 @shared_task()
@@ -75,3 +76,18 @@ def add_to(pk: int, version: int, value: int) -> int:
 @shared_task(base=TaskRunFromSignature)
 def sum_(_: int, __: int, values: list[int]) -> int:
     return sum(values)
+
+
+@shared_task(base=TaskRunFromSignature)
+def process_chunk(pk: int, version: int, chunk: list[int]) -> int:
+    from .models import Job
+
+    job = Job.objects.get(pk=pk)
+    done = 0
+    with job.cancellation_token() as cancelled, job.progress_reporter() as reporter:
+        for __ in chunk:
+            if cancelled:
+                break
+            reporter.incr_progress()
+            done += 1
+    return done
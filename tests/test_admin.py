@@ -33,6 +33,42 @@ def test_celery_changelist(django_app, std_user, job):
     assert res.status_code == 200
 
 
+def test_celery_changelist_prefetch(django_app, std_user, job, queued):
+    url = reverse("admin:demo_job_changelist")
+
+    with mock.patch.object(Job, "prefetch_live_info", wraps=Job.prefetch_live_info) as prefetch:
+        with user_grant_permission(std_user, ["demo.view_job"]):
+            res = django_app.get(url, user=std_user)
+    assert res.status_code == 200
+    assert prefetch.call_count == 1
+    assert {obj.pk for obj in prefetch.call_args[0][0]} == {job.pk, queued.pk}
+
+
+def test_celery_changelist_prefetch_columns(django_app, std_user, job, queued):
+    from django.contrib.admin import site
+
+    url = reverse("admin:demo_job_changelist")
+    model_admin = site._registry[Job]
+    with mock.patch.object(Job, "prefetch_live_info", wraps=Job.prefetch_live_info) as prefetch:
+        with mock.patch.object(Job, "get_task_positions", wraps=Job.get_task_positions) as positions:
+            with user_grant_permission(std_user, ["demo.view_job"]):
+                with mock.patch.object(model_admin, "list_display", ("__str__",)):
+                    assert django_app.get(url, user=std_user).status_code == 200
+                assert prefetch.call_count == 0
+                with mock.patch.object(model_admin, "list_display", ("__str__", "progress_info")):
+                    assert django_app.get(url, user=std_user).status_code == 200
+    assert prefetch.call_args.kwargs == {"status": False, "position": False, "tracking": True}
+    assert positions.call_count == 0
+
+
+def test_get_object_status_cache(db, rf, job):
+    from django.contrib.admin import site
+
+    obj = site._registry[Job].get_object(rf.get("/"), str(job.pk))
+    assert obj.celery_status_cache_ttl == site._registry[Job].status_cache_ttl
+    assert obj.task_status == Job.NOT_SCHEDULED
+
+
 def test_celery_change(django_app, std_user, job):
     url = reverse("admin:demo_job_change", args=(job.id,))
     with user_grant_permission(std_user, ["demo.change_job"]):
@@ -178,3 +214,20 @@ def test_progress_info(db):
     job.set_total(100)
     job.set_progress(75)
     assert admin.progress_info(job) == "75/100"
+
+
+def test_progress_stats_info(db):
+    from demo.factories import JobFactory
+    from django_celery_boost.admin import CeleryTaskModelAdmin
+
+    admin = CeleryTaskModelAdmin(Job, None)
+    job = JobFactory()
+    assert admin.progress_stats_info(job) == "-"
+
+    job.queue()
+    job.set_total(100)
+    job.set_progress(50)
+    assert admin.progress_stats_info(job) == "-/s, 0:00:00"
+
+    job.set_tracking_info("rate", "25")
+    assert admin.progress_stats_info(job) == "25/s, 0:00:00, ETA 0:00:02"
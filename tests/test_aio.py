@@ -0,0 +1,134 @@
+import asyncio
+import json
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from demo.factories import JobFactory
+from demo.models import Job
+from django.test import AsyncRequestFactory
+
+from django_celery_boost import aio, models, views
+from django_celery_boost.models import QueueFull
+
+
+@pytest.mark.parametrize("scripts", [True, False], ids=["script", "scan"])
+def test_aqueue_aterminate(db, scripts):
+    job1: Job = JobFactory()
+    with mock.patch("django_celery_boost.broker.CELERY_BOOST_QUEUE_SCRIPTS", scripts):
+        assert async_to_sync(job1.atask_status)() == Job.NOT_SCHEDULED
+        task_id = async_to_sync(job1.aqueue)()
+        assert task_id
+        assert async_to_sync(job1.aqueue)() is None
+        assert async_to_sync(job1.atask_status)() == Job.QUEUED
+        assert job1.task_status == Job.QUEUED
+
+        assert async_to_sync(job1.aterminate)() == Job.CANCELED
+    assert Job.get_queue_size() == 0
+    job1.refresh_from_db()
+    assert job1.local_status == Job.CANCELED
+    assert job1.curr_async_result_id is None
+    assert async_to_sync(job1.aterminate)() == Job.UNKNOWN
+
+
+def test_aqueue_backpressure(db):
+    jobs = [JobFactory() for __ in range(2)]
+    jobs[0].queue()
+    with mock.patch.multiple(Job, celery_queue_high_watermark=1, celery_queue_low_watermark=0):
+        with mock.patch("django_celery_boost.models.CELERY_BOOST_QUEUE_DEPTH_INTERVAL", 0):
+            with pytest.raises(QueueFull):
+                async_to_sync(jobs[1].aqueue)()
+            with mock.patch.object(Job, "celery_queue_backpressure", "defer"):
+                assert async_to_sync(jobs[1].aqueue)()
+    assert jobs[1].queue_entry["headers"]["eta"]
+    models._queue_depth.clear()
+    models._saturated.clear()
+
+
+def test_atask_status(db):
+    job1: Job = JobFactory()
+    job1.queue()
+    Job.celery_app.backend.store_result(job1.curr_async_result_id, "ok", Job.SUCCESS)
+    assert async_to_sync(job1.atask_status)() == Job.SUCCESS
+
+    missing: Job = JobFactory(curr_async_result_id="missing")
+    assert async_to_sync(missing.atask_status)() == Job.MISSING
+
+    with mock.patch.object(Job.celery_app.control, "revoke") as revoke:
+        assert async_to_sync(job1.aterminate)() == Job.REVOKED
+    revoke.assert_called_once()
+
+
+def test_aget_tracking_info(db):
+    job1: Job = JobFactory()
+    assert async_to_sync(job1.aget_tracking_info)() is None
+    job1.queue()
+    assert async_to_sync(job1.aget_tracking_info)() is None
+    job1.set_tracking_info("progress", "50")
+    job1.set_tracking_info("message", "halfway")
+    assert async_to_sync(job1.aget_tracking_info)() == {"progress": "50", "message": "halfway"}
+    assert async_to_sync(job1.aget_tracking_info)("progress", "other") == {"progress": "50"}
+    assert async_to_sync(job1.aget_tracking_info)("other") is None
+
+
+def test_tracking_hub(db):
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    job1.queue()
+    job2.queue()
+
+    async def listen():
+        hub = aio.get_tracking_hub(Job.celery_app)
+        async with hub.listen([job1.curr_async_result_id]) as queue1:
+            async with hub.listen([job1.curr_async_result_id, job2.curr_async_result_id]) as queue2:
+                await sync_to_async(job1.set_progress)(1)
+                await sync_to_async(job2.incr_progress)(2)
+                assert await asyncio.wait_for(queue1.get(), 5) == (job1.curr_async_result_id, {"progress": "1"})
+                assert await asyncio.wait_for(queue2.get(), 5) == (job1.curr_async_result_id, {"progress": "1"})
+                assert await asyncio.wait_for(queue2.get(), 5) == (job2.curr_async_result_id, {"progress": "2"})
+            assert set(hub.listeners) == {job1.curr_async_result_id}
+        assert not hub.listeners
+
+    with mock.patch("django_celery_boost.models.CELERY_BOOST_TRACKING_PUBLISH", True):
+        async_to_sync(listen)()
+
+
+def test_tracking_events(db):
+    job1: Job = JobFactory()
+    job1.queue()
+    job1.set_total(10)
+
+    async def stream():
+        request = AsyncRequestFactory().get("/", {"task": [job1.curr_async_result_id, "missing"]})
+        request.auser = mock.AsyncMock(return_value=mock.Mock(is_active=True, is_staff=True))
+        response = await views.tracking_events(request)
+        assert response["Content-Type"] == "text/event-stream"
+        events = aiter(response.streaming_content)
+        first = (await anext(events)).decode()
+        with job1.progress_reporter() as reporter:
+            await sync_to_async(reporter.incr_progress)(3)
+            await sync_to_async(reporter.flush)()
+        second = (await asyncio.wait_for(anext(events), 5)).decode()
+        await events.aclose()
+        return first, second
+
+    with mock.patch("django_celery_boost.models.CELERY_BOOST_TRACKING_PUBLISH", True):
+        first, second = async_to_sync(stream)()
+    assert first == f'event: tracking\ndata: {{"task": "{job1.curr_async_result_id}", "data": {{"total": "10"}}}}\n\n'
+    assert json.loads(second.split("data: ")[1]) == {"task": job1.curr_async_result_id, "data": {"progress": "3"}}
+
+    response = async_to_sync(views.tracking_events)(AsyncRequestFactory().get("/"))
+    assert response.status_code == 400
+
+
+def test_tracking_events_permission(db):
+    request = AsyncRequestFactory().get("/", {"task": ["1"]})
+    # no authentication middleware
+    assert async_to_sync(views.tracking_events)(request).status_code == 403
+    request.auser = mock.AsyncMock(return_value=mock.Mock(is_active=True, is_staff=False))
+    assert async_to_sync(views.tracking_events)(request).status_code == 403
+
+    check = mock.Mock(return_value=False)
+    with mock.patch("django_celery_boost.views.import_string", return_value=check):
+        assert async_to_sync(views.tracking_events)(request).status_code == 403
+    check.assert_called_once_with(request, ["1"])
@@ -0,0 +1,335 @@
+import json
+import time
+from unittest import mock
+
+import pytest
+from demo.factories import JobFactory
+from demo.models import Job
+
+from django_celery_boost import broker
+
+
+@pytest.fixture
+def queue_index():
+    with mock.patch("django_celery_boost.broker.CELERY_BOOST_QUEUE_INDEX", True):
+        yield
+    with Job.celery_app.pool.acquire(block=True) as conn:
+        conn.default_channel.client.delete(broker.get_index_key(Job.celery_task_queue))
+
+
+def get_client():
+    return Job.celery_app.pool.acquire(block=True)
+
+
+def test_index_maintained_on_publish(db, queue_index):
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    job1.queue()
+    job2.queue()
+
+    with get_client() as conn:
+        client = conn.default_channel.client
+        assert broker.index_position(client, Job.celery_task_queue, job1.curr_async_result_id) == 1
+        assert broker.index_position(client, Job.celery_task_queue, job2.curr_async_result_id) == 2
+        assert broker.index_position(client, Job.celery_task_queue, "missing") == 0
+
+    assert job1.queue_position == 1
+    assert job2.queue_position == 2
+    assert job2.is_queued()
+    assert job2.queue_entry["headers"]["id"] == job2.curr_async_result_id
+
+
+def test_index_pruned_on_terminate(db, queue_index):
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    job1.queue()
+    job2.queue()
+
+    job1.terminate()
+    assert not job1.is_queued()
+    assert job2.queue_position == 1
+
+
+def test_index_stale_fallback(db, queue_index):
+    job1: Job = JobFactory()
+    job1.queue()
+    with get_client() as conn:
+        client = conn.default_channel.client
+        client.delete(broker.get_index_key(Job.celery_task_queue))
+        assert broker.index_position(client, Job.celery_task_queue, job1.curr_async_result_id) is None
+
+        assert job1.queue_position == 1
+        # the first lookup rebuilds the index
+        assert broker.index_position(client, Job.celery_task_queue, job1.curr_async_result_id) == 1
+
+
+def test_index_stale_rebuild_rate_limited(db, queue_index):
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    job1.queue()
+    job2.queue()
+    with get_client() as conn:
+        client = conn.default_channel.client
+        # a task consumed without pruning the index keeps it stale
+        client.zadd(broker.get_index_key(Job.celery_task_queue), {"consumed": -10})
+        with mock.patch("django_celery_boost.broker.rebuild_index", wraps=broker.rebuild_index) as rebuild:
+            with mock.patch("django_celery_boost.broker.scan_queue", wraps=broker.scan_queue) as scan:
+                assert Job.get_task_position(job2.curr_async_result_id) == 2
+                client.zadd(broker.get_index_key(Job.celery_task_queue), {"consumed": -10})
+                assert Job.get_task_position(job2.curr_async_result_id) == 2
+                assert Job.get_task_positions([job1.curr_async_result_id]) == {job1.curr_async_result_id: 1}
+                assert Job.get_queued_ids([job1.curr_async_result_id]) == {job1.curr_async_result_id}
+        assert rebuild.call_count == 1
+        assert scan.call_count == 3
+
+
+def test_rebuild_index(db, queue_index):
+    jobs = [JobFactory() for __ in range(3)]
+    for job in jobs:
+        job.queue()
+    with get_client() as conn:
+        client = conn.default_channel.client
+        # consumed without pruning the index, and indexed by a publish not pushed yet
+        client.rpop(Job.celery_task_queue)
+        broker.index_add(client, Job.celery_task_queue, "in-flight")
+        ids = [jobs[2].curr_async_result_id, jobs[1].curr_async_result_id, jobs[0].curr_async_result_id]
+        assert broker.index_positions(client, Job.celery_task_queue, ids) is None
+
+        assert broker.rebuild_index(client, Job.celery_task_queue, [*ids, "in-flight"]) == [2, 1, 0, 0]
+        assert broker.index_positions(client, Job.celery_task_queue, ids) == [2, 1, 0]
+
+        Job.purge()
+        assert not client.exists(broker.get_index_key(Job.celery_task_queue))
+        assert not client.exists(broker.get_index_sequence_key(Job.celery_task_queue))
+
+
+def test_index_disabled(db):
+    job1: Job = JobFactory()
+    job1.queue()
+    with get_client() as conn:
+        client = conn.default_channel.client
+        assert not client.exists(broker.get_index_key(Job.celery_task_queue))
+    assert job1.queue_position == 1
+
+
+def test_script_position(db):
+    jobs = [JobFactory() for _ in range(3)]
+    for job in jobs:
+        job.queue()
+
+    with get_client() as conn:
+        client = conn.default_channel.client
+        with mock.patch("django_celery_boost.broker.CELERY_BOOST_QUEUE_SCAN_WINDOW", 2):
+            assert [broker.script_position(client, Job.celery_task_queue, j.curr_async_result_id) for j in jobs] == [
+                1,
+                2,
+                3,
+            ]
+        assert broker.script_position(client, Job.celery_task_queue, "missing") == 0
+
+
+def test_script_find(db):
+    job1: Job = JobFactory()
+    job1.queue()
+
+    with get_client() as conn:
+        client = conn.default_channel.client
+        message = broker.script_find(client, Job.celery_task_queue, job1.curr_async_result_id)
+        assert json.loads(message)["headers"]["id"] == job1.curr_async_result_id
+        assert broker.script_find(client, Job.celery_task_queue, "missing") is None
+
+
+def test_script_remove(db):
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    job1.queue()
+    job2.queue()
+
+    with get_client() as conn:
+        client = conn.default_channel.client
+        assert broker.script_remove(
+            client, Job.celery_task_queue, Job.celery_task_revoked_queue, job1.curr_async_result_id
+        )
+        assert not broker.script_remove(client, Job.celery_task_queue, Job.celery_task_revoked_queue, "missing")
+        assert client.llen(Job.celery_task_queue) == 1
+        assert client.sismember(Job.celery_task_revoked_queue, job1.curr_async_result_id)
+    assert job2.queue_position == 1
+
+
+def test_scripts_disabled(db):
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    with mock.patch("django_celery_boost.broker.CELERY_BOOST_QUEUE_SCRIPTS", False):
+        job1.queue()
+        job2.queue()
+        assert job2.queue_position == 2
+        assert job2.queue_entry["headers"]["id"] == job2.curr_async_result_id
+        assert job1.terminate() == Job.CANCELED
+        assert job2.queue_position == 1
+
+
+@pytest.mark.parametrize("from_tail", [False, True], ids=["head", "tail"])
+def test_scan_queue(db, from_tail):
+    jobs = [JobFactory() for _ in range(5)]
+    for job in jobs:
+        job.queue()
+    expected = {job.curr_async_result_id: i for i, job in enumerate(jobs, 1)}
+
+    with get_client() as conn:
+        client = conn.default_channel.client
+        entries = list(broker.scan_queue(client, Job.celery_task_queue, window=2, from_tail=from_tail))
+    assert {json.loads(message)["headers"]["id"]: pos for pos, message in entries} == expected
+    assert [pos for pos, __ in entries] == ([1, 2, 3, 4, 5] if from_tail else [5, 4, 3, 2, 1])
+
+
+def test_scan_queue_early_exit(db):
+    for __ in range(5):
+        JobFactory().queue()
+
+    with get_client() as conn:
+        client = conn.default_channel.client
+        with mock.patch.object(client, "pipeline", wraps=client.pipeline) as pipeline:
+            for __ in broker.scan_queue(client, Job.celery_task_queue, window=2):
+                break
+        assert pipeline.call_count == 1
+
+    assert len(list(Job.celery_queue_entries(window=2))) == 5
+
+
+def test_decode_message_info(db):
+    job1: Job = JobFactory()
+    job1.queue()
+    message = Job.get_queue_entries()[0]
+
+    info = broker.decode_message_info(message)
+    assert info == (job1.curr_async_result_id, "demo.tasks.process_job", None)
+    assert broker.decode_headers(message) == json.loads(message)["headers"]
+    assert broker.decode_message_info(message.decode()).id == job1.curr_async_result_id
+
+
+def test_decode_headers_other_layout():
+    message = json.dumps({"headers": {"id": "1", "eta": "2024-01-01T00:00:00"}, "body": "e30="}, separators=(",", ":"))
+    assert broker.decode_message_info(message) == ("1", None, "2024-01-01T00:00:00")
+    assert broker.decode_headers(json.dumps({"body": ""})) == {}
+    # a properties marker inside the headers is not mistaken for the end of the headers
+    message = json.dumps({"body": "", "headers": {"id": '1, "properties": {'}, "properties": {}})
+    assert broker.decode_headers(message) == {"id": '1, "properties": {'}
+
+
+def test_decode_headers_orjson():
+    pytest.importorskip("orjson")
+    message = json.dumps({"body": "e30=", "headers": {"id": "1"}, "properties": {"priority": 0}})
+    with mock.patch.object(broker, "_decoder") as decoder:
+        assert broker.decode_headers(message) == {"id": "1"}
+    decoder.raw_decode.assert_not_called()
+
+
+@pytest.mark.parametrize("scripts", [True, False], ids=["script", "pipeline"])
+def test_queue_stats(db, scripts):
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    job3: Job = JobFactory()
+    for job in (job1, job2, job3):
+        job.queue()
+
+    with get_client() as conn:
+        client = conn.default_channel.client
+        # job2 is flagged as revoked but still queued, job3 has been fetched by a worker
+        client.sadd(Job.celery_task_revoked_queue, job2.curr_async_result_id, "other")
+        message = client.lindex(Job.celery_task_queue, 0)
+        client.lrem(Job.celery_task_queue, 1, message)
+        client.hset("unacked", "tag", json.dumps([json.loads(message), "", Job.celery_task_queue]))
+        try:
+            with mock.patch("django_celery_boost.broker.CELERY_BOOST_QUEUE_SCRIPTS", scripts):
+                revoked, stats = broker.queue_stats(
+                    client, [Job.celery_task_queue, "empty"], Job.celery_task_revoked_queue, scan=True
+                )
+                # without index canceled tasks are counted only on request
+                __, cheap = broker.queue_stats(client, [Job.celery_task_queue], Job.celery_task_revoked_queue)
+        finally:
+            client.delete("unacked", Job.celery_task_revoked_queue)
+
+    assert revoked == 2
+    assert stats == {
+        Job.celery_task_queue: (2, 1, 1, job1.curr_async_result_id),
+        # without scripts the reserved messages are not split by queue
+        "empty": (0, 0, 0 if scripts else 1, None),
+    }
+    assert cheap[Job.celery_task_queue].canceled == 0
+
+
+@pytest.mark.parametrize("scripts", [True, False], ids=["script", "pipeline"])
+def test_queue_stats_index(db, queue_index, scripts):
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    job1.queue()
+    job2.queue()
+    with get_client() as conn:
+        client = conn.default_channel.client
+        client.sadd(Job.celery_task_revoked_queue, job1.curr_async_result_id)
+        try:
+            with mock.patch("django_celery_boost.broker.CELERY_BOOST_QUEUE_SCRIPTS", scripts):
+                __, stats = broker.queue_stats(client, [Job.celery_task_queue], Job.celery_task_revoked_queue)
+                assert stats[Job.celery_task_queue].canceled == 1
+                # more revoked ids than queued tasks
+                client.sadd(Job.celery_task_revoked_queue, "a", "b", "c")
+                __, stats = broker.queue_stats(client, [Job.celery_task_queue], Job.celery_task_revoked_queue)
+                assert stats[Job.celery_task_queue].canceled == 1
+        finally:
+            client.delete(Job.celery_task_revoked_queue)
+
+
+def test_celery_queues_info(db):
+    job1: Job = JobFactory()
+    job1.queue()
+    info = Job.celery_queues_info(Job.celery_task_queue, "empty", oldest=True)
+    assert info[Job.celery_task_queue]["pending"] == 1
+    assert info[Job.celery_task_queue]["oldest"] >= 0
+    assert info["empty"] == {"size": 0, "pending": 0, "reserved": 0, "canceled": 0, "revoked": 0, "oldest": None}
+    assert Job.celery_queue_info()["size"] == 1
+
+
+@pytest.fixture
+def snapshot_key():
+    key = broker.get_snapshot_key(Job.celery_task_queue)
+    yield key
+    with get_client() as conn:
+        conn.default_channel.client.delete(key, f"{key}:lock")
+
+
+def test_snapshot(db, snapshot_key):
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    job1.queue()
+    job2.queue()
+
+    with get_client() as conn:
+        client = conn.default_channel.client
+        ids = [job1.curr_async_result_id, job2.curr_async_result_id, "missing"]
+        assert broker.snapshot_positions(client, Job.celery_task_queue, ids, 10) == [1, 2, 0]
+
+        # served from the snapshot until it is older than max_age
+        client.lpop(Job.celery_task_queue)
+        assert broker.snapshot_positions(client, Job.celery_task_queue, ids, 10) == [1, 2, 0]
+        with mock.patch("django_celery_boost.broker.time.time", return_value=time.time() + 11):
+            assert broker.snapshot_positions(client, Job.celery_task_queue, ids, 10) == [1, 0, 0]
+
+        # someone else is rebuilding it: the stale snapshot is served for a bounded time
+        client.lpop(Job.celery_task_queue)
+        client.set(f"{snapshot_key}:lock", "other")
+        with mock.patch("django_celery_boost.broker.time.time", return_value=time.time() + 22):
+            assert broker.snapshot_positions(client, Job.celery_task_queue, ids, 10) == [1, 0, 0]
+        with mock.patch("django_celery_boost.broker.time.time", return_value=time.time() + 52):
+            assert broker.snapshot_positions(client, Job.celery_task_queue, ids, 10) is None
+        client.delete(snapshot_key)
+        assert broker.snapshot_positions(client, Job.celery_task_queue, ids, 10) is None
+
+
+def test_snapshot_model(db, snapshot_key):
+    job1: Job = JobFactory()
+    job1.queue()
+    with mock.patch.object(Job, "celery_queue_snapshot_max_age", 10):
+        with mock.patch("django_celery_boost.broker.build_snapshot", wraps=broker.build_snapshot) as build:
+            assert job1.queue_position == 1
+            assert Job.get_queued_ids([job1.curr_async_result_id, "missing"]) == {job1.curr_async_result_id}
+        assert build.call_count == 1
@@ -85,6 +85,7 @@ def test_celery_queue_status_no_app(transactional_db, reset_queue):
     assert Job.celery_queue_info() == {
         "canceled": 0,
         "pending": 0,
+        "reserved": 0,
         "revoked": 0,
         "size": 0,
     }
@@ -97,6 +98,7 @@ def test_celery_queue_status_no_app(transactional_db, reset_queue):
     assert Job.celery_queue_info() == {
         "canceled": 0,
         "pending": 3,
+        "reserved": 0,
         "revoked": 0,
         "size": 3,
     }
@@ -110,6 +112,7 @@ def test_celery_queue_status_no_workers(transactional_db, celery_app, reset_queu
     assert Job.celery_queue_info() == {
         "canceled": 0,
         "pending": 0,
+        "reserved": 0,
         "revoked": 0,
         "size": 0,
     }
@@ -125,6 +128,7 @@ def test_celery_queue_status_no_workers(transactional_db, celery_app, reset_queu
     assert Job.celery_queue_info() == {
         "canceled": 0,
         "pending": 1,
+        "reserved": 0,
         "revoked": 1,
         "size": 1,
     }
@@ -136,6 +140,7 @@ def test_celery_queue_status_no_workers(transactional_db, celery_app, reset_queu
     assert Job.celery_queue_info() == {
         "canceled": 0,
         "pending": 0,
+        "reserved": 0,
         "revoked": 1,
         "size": 0,
     }
@@ -149,6 +154,7 @@ def test_celery_queue_status_workers(transactional_db, celery_app, celery_worker
     assert Job.celery_queue_info() == {
         "canceled": 0,
         "pending": 0,
+        "reserved": 0,
         "revoked": 0,
         "size": 0,
     }
@@ -161,6 +167,7 @@ def test_celery_queue_status_workers(transactional_db, celery_app, celery_worker
     assert Job.celery_queue_info() == {
         "canceled": 0,
         "pending": 0,
+        "reserved": 0,
         "revoked": 0,
         "size": 0,
     }
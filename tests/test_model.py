@@ -1,12 +1,32 @@
 import json
+import time
+from contextlib import ExitStack
+from io import StringIO
 from time import sleep
 from unittest import mock
 from unittest.mock import Mock, PropertyMock
 from uuid import uuid4
 
+import pytest
+from asgiref.sync import async_to_sync
+from celery.app.task import Context
+from celery.exceptions import MaxRetriesExceededError, Retry
 from celery.result import AsyncResult
 from demo.factories import AsyncJobModelFactory, JobFactory
 from demo.models import Job
+from demo.tasks import process_job
+from django.core.management import call_command
+
+from django_celery_boost import broker, models
+from django_celery_boost.contrib.outbox.models import TaskOutbox
+from django_celery_boost.models import (
+    COALESCE_HEADER,
+    GROUP_WAITS_HEADER,
+    QueueFull,
+    coalesced_task_finished,
+    coalesced_task_started,
+)
+from django_celery_boost.signals import task_revoked, task_terminated, tasks_queued
 
 
 def test_model_initialize_new(db):
@@ -23,6 +43,7 @@ def test_model_initialize_new(db):
     assert job.celery_queue_info() == {
         "canceled": 0,
         "pending": 0,
+        "reserved": 0,
         "revoked": 0,
         "size": 0,
     }
@@ -146,6 +167,327 @@ def test_revoke(db):
     assert job1.task_status == Job.QUEUED
 
 
+def test_queue_on_commit(db, django_capture_on_commit_callbacks):
+    job1: Job = JobFactory()
+    with mock.patch.object(Job, "celery_queue_on_commit", True):
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            task_id = job1.queue()
+            # saved before the message is published
+            assert Job.objects.get(curr_async_result_id=task_id) == job1
+            assert Job.get_queue_size() == 0
+        assert len(callbacks) == 1
+        assert job1.datetime_queued
+        assert Job.get_queue_entries()
+        assert job1.queue_entry["headers"]["id"] == task_id
+        assert job1.queue() is None
+
+        job2: Job = JobFactory()
+        Job.objects.filter(pk=job2.pk).update(curr_async_result_id="other")
+        with django_capture_on_commit_callbacks() as callbacks:
+            assert job2.queue() is None
+        assert not callbacks
+
+
+def test_group_lease(db):
+    job1: Job = JobFactory(group_key="tenant")
+    job2: Job = JobFactory(group_key="tenant")
+    task1, task2 = Mock(), Mock()
+    task1.request, task2.request = Context(id="task1", retries=0), Context(id="task2", retries=2)
+
+    with job1.group_lease(task1):
+        with pytest.raises(Retry):
+            with job2.group_lease(task2):
+                pass
+        task2.signature_from_request.assert_called_once_with(
+            task2.request,
+            countdown=Job.celery_group_retry_countdown,
+            retries=2,
+            headers={GROUP_WAITS_HEADER: 1},
+        )
+        task2.signature_from_request.return_value.apply_async.assert_called_once_with()
+        with mock.patch.object(Job, "celery_group_max_parallel", 2):
+            with job2.group_lease(task2):
+                pass
+    with job2.group_lease(task2):
+        pass
+
+    # leases of crashed workers expire
+    with mock.patch.object(Job, "celery_group_lease_ttl", 0.05):
+        job1.group_lease(task1).__enter__()
+    sleep(0.1)
+    with job2.group_lease(task2):
+        pass
+
+    no_group: Job = JobFactory()
+    with no_group.group_lease(task2):
+        pass
+
+
+def test_group_lease_waits(db):
+    """Waiting for a lease does not spend the task retries."""
+    job: Job = JobFactory(group_key="tenant", op="upper", name="abc")
+    busy = [False] * 5 + [True]
+    # eager retries are applied again only if errors are not propagated
+    conf = process_job.app.conf
+    propagates, conf["CELERY_TASK_EAGER_PROPAGATES"] = conf.task_eager_propagates, False
+    try:
+        with mock.patch("django_celery_boost.broker.lease_acquire", side_effect=busy) as acquire:
+            assert process_job.apply(args=(job.pk,)).get() == "ABC"
+        assert acquire.call_count == 6
+
+        with mock.patch("django_celery_boost.broker.lease_acquire", return_value=False) as acquire:
+            with mock.patch.object(Job, "celery_group_max_waits", 2):
+                with pytest.raises(MaxRetriesExceededError):
+                    process_job.apply(args=(job.pk,)).get()
+        assert acquire.call_count == 3
+    finally:
+        conf["CELERY_TASK_EAGER_PROPAGATES"] = propagates
+
+
+@pytest.fixture
+def coalesce():
+    with mock.patch.object(Job, "celery_queue_coalesce", 10):
+        yield
+    with Job.celery_app.pool.acquire(block=True) as conn:
+        client = conn.default_channel.client
+        keys = list(client.scan_iter(broker.get_coalesce_key(Job._meta.label_lower, "*")))
+        if keys:
+            client.delete(*keys)
+
+
+def test_queue_coalesced(db, coalesce):
+    job1: Job = JobFactory()
+    task = Mock()
+
+    def run(state=Job.SUCCESS):
+        setattr(task.request, COALESCE_HEADER, [Job._meta.label_lower, job1.pk])
+        coalesced_task_started(task=task)
+        yield
+        coalesced_task_finished(task=task, state=state)
+
+    task_id = job1.queue()
+    assert task_id
+    assert job1.queue() is None
+    assert Job.get_queue_size() == 1
+    assert job1.queue_entry["headers"][COALESCE_HEADER] == [Job._meta.label_lower, job1.pk]
+    assert job1.queue_entry["headers"]["eta"]
+
+    # queued while running: one follow-up
+    running = run()
+    next(running)
+    assert job1.queue() is None
+    assert job1.queue() is None
+    next(running, None)
+    assert Job.get_queue_size() == 2
+    assert job1.queue() is None
+
+    # retried: still queued
+    running = run(Job.RETRY)
+    next(running)
+    next(running, None)
+    assert job1.queue() is None
+
+    # nothing happened while running
+    running = run()
+    next(running)
+    next(running, None)
+    assert Job.get_queue_size() == 2
+    assert job1.queue()
+    assert Job.get_queue_size() == 3
+
+
+def test_queue_coalesced_publish_error(db, coalesce, backpressure):
+    """A failed publish does not leave the record flagged as queued."""
+    job1: Job = JobFactory()
+    with mock.patch.object(Job, "task_handler") as task_handler:
+        task_handler.apply_async.side_effect = ConnectionError()
+        with pytest.raises(ConnectionError):
+            job1.queue()
+    assert job1.queue()
+
+    # coalesced queueing is subject to backpressure too
+    job2: Job = JobFactory()
+    with mock.patch.multiple(Job, celery_queue_high_watermark=1, celery_queue_low_watermark=0):
+        with mock.patch("django_celery_boost.models.CELERY_BOOST_QUEUE_DEPTH_INTERVAL", 0):
+            with pytest.raises(QueueFull):
+                job2.queue()
+    models._saturated.clear()
+    assert job2.queue()
+
+
+def test_queue_coalesced_terminated(db, coalesce):
+    """Revoked tasks never reset the coalescing state, terminating does."""
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    assert job1.queue()
+    assert job1.terminate() == Job.CANCELED
+    assert job1.queue()
+
+    job1.revoke()
+    assert job1.queue()
+
+    assert job2.queue()
+    Job.objects.filter(pk__in=[job1.pk, job2.pk]).terminate()
+    assert job1.queue()
+    assert job2.queue()
+
+    Job.objects.filter(pk__in=[job1.pk, job2.pk]).revoke()
+    assert job2.queue()
+
+    job1.refresh_from_db()
+    assert async_to_sync(job1.aterminate)() == Job.CANCELED
+    assert job1.queue()
+
+
+def test_queue_outbox(db, django_capture_on_commit_callbacks):
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    active: Job = JobFactory()
+    active.queue()
+
+    with mock.patch.object(Job, "celery_queue_outbox", True):
+        task_id = job1.queue()
+        # the id is stored on the record at once
+        assert Job.objects.get(pk=job1.pk).curr_async_result_id == task_id
+        assert job1.task_status == Job.MISSING
+        job1.save()
+        # the last request sets the version
+        assert job1.queue() == task_id
+        assert job2.queue(use_version=False)
+        assert active.queue() is None
+        job3: Job = JobFactory()
+        job4: Job = JobFactory()
+        dropped = [job3.queue(), job4.queue()]
+        job3.delete()
+        Job.objects.filter(pk=job4.pk).update(curr_async_result_id=None)
+    assert Job.get_queue_size() == 1
+    assert TaskOutbox.objects.count() == 4
+
+    handler = Mock()
+    tasks_queued.connect(handler, sender=Job)
+    try:
+        out = StringIO()
+        with django_capture_on_commit_callbacks(execute=True):
+            call_command("celery_boost_relay", batch_size=2, stdout=out)
+            # published only when the transaction commits
+            assert Job.get_queue_size() == 1
+    finally:
+        tasks_queued.disconnect(handler, sender=Job)
+    assert out.getvalue() == "4 tasks published\n"
+    assert not TaskOutbox.objects.exists()
+    # the second batch only has the deleted and the reset records
+    assert handler.call_count == 1
+    assert {obj.pk for obj in handler.call_args[1]["tasks"]} == {job1.pk, job2.pk}
+    assert Job.get_queue_size() == 3
+    assert [AsyncResult(task_id).state for task_id in dropped] == [Job.REVOKED, Job.REVOKED]
+
+    job1.refresh_from_db()
+    job2.refresh_from_db()
+    assert job1.curr_async_result_id == task_id
+    assert job1.datetime_queued
+    assert job1.queue_entry["headers"]["argsrepr"] == repr((job1.pk, job1.version))
+    assert job2.queue_entry["headers"]["argsrepr"] == repr((job2.pk, None))
+
+
+def test_queue_outbox_check(db):
+    with mock.patch.object(Job, "celery_queue_outbox", True):
+        assert not [e for e in Job.check() if e.id == "django_celery_boost.E004"]
+        with mock.patch("django_celery_boost.models.apps.is_installed", return_value=False):
+            assert [e.id for e in Job.check() if e.id == "django_celery_boost.E004"] == ["django_celery_boost.E004"]
+
+
+def test_queue_outbox_publish_error(db, django_capture_on_commit_callbacks):
+    job1: Job = JobFactory()
+    with mock.patch.object(Job, "celery_queue_outbox", True):
+        task_id = job1.queue()
+
+    with mock.patch.object(Job.task_handler, "apply_async", side_effect=Exception("broker down")):
+        with django_capture_on_commit_callbacks(execute=True):
+            assert TaskOutbox.objects.relay() == 1
+    # stored again for the next run
+    assert TaskOutbox.objects.get().task_id == task_id
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert TaskOutbox.objects.relay() == 1
+    assert not TaskOutbox.objects.exists()
+    job1.refresh_from_db()
+    assert job1.curr_async_result_id == task_id
+    assert job1.is_queued()
+
+
+@pytest.fixture
+def backpressure():
+    models._queue_depth.clear()
+    models._saturated.clear()
+    with mock.patch.multiple(Job, celery_queue_high_watermark=2, celery_queue_low_watermark=1):
+        yield
+    models._queue_depth.clear()
+    models._saturated.clear()
+
+
+def test_backpressure_raise(db, backpressure):
+    jobs = [JobFactory() for __ in range(4)]
+    with mock.patch("django_celery_boost.models.CELERY_BOOST_QUEUE_DEPTH_INTERVAL", 0):
+        jobs[0].queue()
+        jobs[1].queue()
+        with pytest.raises(QueueFull):
+            jobs[2].queue()
+        assert jobs[2].curr_async_result_id is None
+
+        # resumes only below the low watermark
+        with Job.celery_app.pool.acquire(block=True) as conn:
+            conn.default_channel.client.rpop(Job.celery_task_queue)
+        with pytest.raises(QueueFull):
+            jobs[2].queue()
+        with Job.celery_app.pool.acquire(block=True) as conn:
+            conn.default_channel.client.rpop(Job.celery_task_queue)
+        assert jobs[2].queue()
+
+
+def test_backpressure_cached_size(db, backpressure):
+    jobs = [JobFactory() for __ in range(3)]
+    with mock.patch("django_celery_boost.models.CELERY_BOOST_QUEUE_DEPTH_INTERVAL", 60):
+        with mock.patch.object(Job, "get_queue_size", wraps=Job.get_queue_size) as get_queue_size:
+            for job in jobs:
+                job.queue()
+        assert get_queue_size.call_count == 1
+    assert Job.get_queue_size() == 3
+
+
+def test_backpressure_defer(db, backpressure):
+    jobs = [JobFactory() for __ in range(3)]
+    with mock.patch("django_celery_boost.models.CELERY_BOOST_QUEUE_DEPTH_INTERVAL", 0):
+        with mock.patch.object(Job, "celery_queue_backpressure", "defer"):
+            for job in jobs:
+                job.queue()
+    assert not jobs[1].queue_entry["headers"]["eta"]
+    assert jobs[2].queue_entry["headers"]["eta"]
+
+
+def test_backpressure_block(db, backpressure):
+    jobs = [JobFactory() for __ in range(3)]
+    with mock.patch("django_celery_boost.models.CELERY_BOOST_QUEUE_DEPTH_INTERVAL", 0):
+        jobs[0].queue()
+        jobs[1].queue()
+        with mock.patch.multiple(Job, celery_queue_backpressure="block", celery_queue_block_timeout=0.3):
+            with pytest.raises(QueueFull):
+                jobs[2].queue()
+            with mock.patch.object(Job, "get_queue_size", side_effect=[2, 0]):
+                assert jobs[2].queue()
+
+
+def test_backpressure_bulk_queue(db, backpressure):
+    jobs = [JobFactory() for __ in range(4)]
+    with mock.patch("django_celery_boost.models.CELERY_BOOST_QUEUE_DEPTH_INTERVAL", 0):
+        assert len(Job.objects.filter(pk__in=[j.pk for j in jobs[:2]]).bulk_queue()) == 2
+        with pytest.raises(QueueFull):
+            Job.objects.filter(pk__in=[j.pk for j in jobs[2:]]).bulk_queue()
+        with mock.patch.object(Job, "celery_queue_backpressure", "defer"):
+            Job.objects.filter(pk__in=[j.pk for j in jobs[2:]]).bulk_queue()
+    jobs[3].refresh_from_db()
+    assert jobs[3].queue_entry["headers"]["eta"]
+
+
 def test_terminate(db):
     job1: Job = JobFactory()
     assert job1.terminate() == Job.UNKNOWN
@@ -171,6 +513,105 @@ def test_terminate(db):
             assert job1.terminate() == job1.CANCELED
 
 
+@pytest.mark.parametrize("scripts", [True, False], ids=["script", "scan"])
+def test_queryset_terminate(db, scripts):
+    with mock.patch("django_celery_boost.broker.CELERY_BOOST_QUEUE_SCRIPTS", scripts):
+        not_scheduled: Job = JobFactory()
+        queued1: Job = JobFactory()
+        queued2: Job = JobFactory()
+        running: Job = JobFactory()
+        other: Job = JobFactory()
+        for job in (queued1, queued2, running, other):
+            job.queue()
+        Job.celery_app.backend.store_result(running.curr_async_result_id, None, Job.STARTED)
+        running_id = running.curr_async_result_id
+
+        terminated = Mock()
+        task_terminated.connect(terminated, sender=Job)
+        try:
+            with mock.patch.object(Job.celery_app.control, "revoke") as revoke:
+                ret = Job.objects.exclude(pk=other.pk).terminate()
+        finally:
+            task_terminated.disconnect(terminated, sender=Job)
+
+    assert ret == {
+        not_scheduled.pk: Job.UNKNOWN,
+        queued1.pk: Job.CANCELED,
+        queued2.pk: Job.CANCELED,
+        running.pk: Job.REVOKED,
+    }
+    revoke.assert_called_once_with([running_id], terminate=True, signal="SIGKILL", reply=False, timeout=None)
+    assert terminated.call_count == 4
+    ids = [queued1.curr_async_result_id, queued2.curr_async_result_id, other.curr_async_result_id]
+    assert Job.get_queued_ids(ids) == {other.curr_async_result_id}
+    assert Job.get_queue_size() == 2  # running (message still there) and other
+    assert other.is_queued()
+
+    queued1.refresh_from_db()
+    running.refresh_from_db()
+    assert queued1.local_status == Job.CANCELED
+    assert queued1.curr_async_result_id is None
+    assert running.local_status == Job.REVOKED
+    assert running.curr_async_result_id == running_id
+
+
+def test_queryset_revoke(db):
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    job1.queue()
+
+    revoked = Mock()
+    task_revoked.connect(revoked, sender=Job)
+    try:
+        with mock.patch.object(Job.celery_app.control, "revoke") as revoke:
+            Job.objects.filter(pk__in=[job1.pk, job2.pk]).revoke()
+    finally:
+        task_revoked.disconnect(revoked, sender=Job)
+    revoke.assert_called_once_with([job1.curr_async_result_id], reply=False, timeout=None)
+    assert revoked.call_count == 2
+
+
+def test_queryset_bulk_queue(db):
+    queued: Job = JobFactory()
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    queued.queue()
+
+    handler = Mock()
+    tasks_queued.connect(handler, sender=Job)
+    try:
+        pool = Job.celery_app.producer_pool
+        with mock.patch.object(pool, "acquire", wraps=pool.acquire) as m:
+            ret = Job.objects.all().bulk_queue()
+    finally:
+        tasks_queued.disconnect(handler, sender=Job)
+
+    assert m.call_count == 1
+    assert set(ret) == {job1.pk, job2.pk}
+    assert handler.call_count == 1
+    assert {task.pk for task in handler.call_args[1]["tasks"]} == {job1.pk, job2.pk}
+    assert Job.get_queue_size() == 3
+
+    job1.refresh_from_db()
+    assert job1.curr_async_result_id == ret[job1.pk]
+    assert job1.datetime_queued
+    assert job1.task_status == Job.QUEUED
+    assert job1.queue_entry["headers"]["argsrepr"] == repr((job1.pk, job1.version))
+    assert Job.objects.all().bulk_queue() == {}
+
+
+def test_queryset_bulk_queue_stores_ids_first(db):
+    job: Job = JobFactory()
+
+    def apply_async(args, task_id, **kwargs):
+        assert Job.objects.get(pk=args[0]).curr_async_result_id == task_id
+
+    with mock.patch.object(Job.task_handler, "apply_async", side_effect=apply_async) as m:
+        ret = Job.objects.all().bulk_queue()
+    assert m.call_count == 1
+    assert m.call_args[1]["task_id"] == ret[job.pk]
+
+
 def test_str(db):
     description = "this is me"
     async_job = AsyncJobModelFactory(description=description)
@@ -178,3 +619,152 @@ def test_str(db):
 
     async_job3 = AsyncJobModelFactory()
     assert str(async_job3) == f"Background Job #{async_job3.pk}"
+
+
+@pytest.mark.parametrize(
+    "lookup",
+    [
+        {"django_celery_boost.broker.CELERY_BOOST_QUEUE_SCRIPTS": True},
+        {},
+        {"django_celery_boost.broker.CELERY_BOOST_QUEUE_INDEX": True},
+    ],
+    ids=["script", "scan", "index"],
+)
+def test_bulk_task_status(db, lookup):
+    with ExitStack() as stack:
+        for target, value in lookup.items():
+            stack.enter_context(mock.patch(target, value))
+        not_scheduled: Job = JobFactory()
+        queued: Job = JobFactory()
+        missing: Job = JobFactory(curr_async_result_id=str(uuid4()))
+        done: Job = JobFactory()
+        queued.queue()
+        done.queue()
+        Job.celery_app.backend.store_result(done.curr_async_result_id, "ok", Job.SUCCESS)
+
+        objs = [not_scheduled, queued, missing, done]
+        expected = {obj.pk: obj.task_status for obj in objs}
+        assert expected == {
+            not_scheduled.pk: Job.NOT_SCHEDULED,
+            queued.pk: Job.QUEUED,
+            missing.pk: Job.MISSING,
+            done.pk: Job.SUCCESS,
+        }
+        assert Job.bulk_task_status(objs) == expected
+        assert Job.bulk_task_status([]) == {}
+
+
+def test_bulk_task_status_error(db):
+    job: Job = JobFactory()
+    job.queue()
+    with mock.patch("demo.models.Job.get_task_states", side_effect=Exception("error")):
+        assert Job.bulk_task_status([job]) == {job.pk: Job.QUEUED}
+
+
+def test_prefetch_live_info(db):
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    job2.queue()
+    job2.set_total(10)
+    job2.set_progress(5)
+
+    Job.prefetch_live_info([job1, job2])
+    with mock.patch.object(Job.celery_app.pool, "acquire", side_effect=AssertionError("Redis called")):
+        assert job1.queue_position == 0
+        assert job2.queue_position == 1
+        assert job1.task_status == Job.NOT_SCHEDULED
+        assert job1.progress == "Unknown"
+        assert job2.task_status == Job.QUEUED
+        assert job2.progress == "5/10"
+        assert job2.get_tracking_info() == {"total": "10", "progress": "5"}
+        assert job2.get_tracking_info("missing") is None
+        assert job2.progress_elapsed is not None
+
+    job2.curr_async_result_id = None
+    assert job2.task_status == Job.NOT_SCHEDULED
+
+
+@pytest.mark.parametrize("index", [False, True], ids=["scan", "index"])
+def test_get_task_positions(db, index):
+    jobs = [JobFactory() for __ in range(3)]
+    try:
+        with mock.patch("django_celery_boost.broker.CELERY_BOOST_QUEUE_INDEX", index):
+            for job in jobs:
+                job.queue()
+            ids = [jobs[2].curr_async_result_id, jobs[0].curr_async_result_id, "missing"]
+            with mock.patch("django_celery_boost.broker.scan_queue", wraps=broker.scan_queue) as scan:
+                assert Job.get_task_positions(ids) == dict(zip(ids, [3, 1, 0]))
+            assert scan.called is not index
+            assert Job.get_task_positions([]) == {}
+    finally:
+        with Job.celery_app.pool.acquire(block=True) as conn:
+            conn.default_channel.client.delete(broker.get_index_key(Job.celery_task_queue))
+
+
+def test_queue_position_finished(db):
+    """Finished tasks do not look for their position."""
+    job: Job = JobFactory()
+    job.queue()
+    Job.celery_app.backend.store_result(job.curr_async_result_id, "ok", Job.SUCCESS)
+    with mock.patch.object(Job, "get_task_position") as get_task_position:
+        assert job.queue_position == 0
+    get_task_position.assert_not_called()
+
+
+def test_get_tracking_info_many(db):
+    job1: Job = JobFactory()
+    job2: Job = JobFactory()
+    job3: Job = JobFactory()
+    job2.queue()
+    job3.queue()
+    job2.set_total(10)
+    job2.set_progress(5)
+
+    pool = Job.celery_app.pool
+    with mock.patch.object(pool, "acquire", wraps=pool.acquire) as acquire:
+        assert Job.get_tracking_info_many([job1, job2, job3]) == {
+            job1.pk: None,
+            job2.pk: {"total": "10", "progress": "5"},
+            job3.pk: None,
+        }
+    assert acquire.call_count == 1
+    assert Job.get_tracking_info_many([job2, job3], "progress", "missing") == {
+        job2.pk: {"progress": "5"},
+        job3.pk: None,
+    }
+    assert Job.get_tracking_info_many([job2.curr_async_result_id, "missing"], "total") == {
+        job2.curr_async_result_id: {"total": "10"},
+        "missing": None,
+    }
+    assert Job.get_tracking_info_many([]) == {}
+
+
+def test_status_cache(db):
+    job: Job = JobFactory()
+    job.queue()
+    job.celery_status_cache_ttl = 60
+
+    assert job.async_result is job.async_result
+    assert job.task_status == Job.QUEUED
+    assert job.task_info["status"] == Job.PENDING
+    # reset celery queue. Memoized values are still returned
+    Job.celery_app.control.purge()
+    assert job.task_status == Job.QUEUED
+
+    with mock.patch("django_celery_boost.models.time.monotonic", return_value=time.monotonic() + 120):
+        assert job.task_status == Job.MISSING
+
+    job.queue()
+    assert job.task_status == Job.QUEUED
+    Job.celery_app.control.purge()
+    job.refresh_from_db()
+    assert job.task_status == Job.MISSING
+
+
+def test_status_cache_disabled(db):
+    job: Job = JobFactory()
+    job.queue()
+    assert job.celery_status_cache_ttl == 0
+    assert job.task_status == Job.QUEUED
+    Job.celery_app.control.purge()
+    assert job.task_status == Job.MISSING
@@ -1,10 +1,14 @@
 from typing import cast
+from unittest.mock import Mock
 
 import pytest
+from celery import group
 
-from demo.factories import AddToJobFactory, JobFactory
-from demo.models import AddToJob, Job
+from demo.factories import AddToJobFactory, JobFactory, ValueJobFactory
+from demo.models import AddToJob, Job, ValueJob
 from django_celery_boost.models import InvalidTaskBase, APP_LABEL, MODEL_NAME
+from django_celery_boost.signals import tasks_queued
+from django_celery_boost.task import batch_apply
 
 pytestmark = [pytest.mark.django_db]
 
@@ -26,3 +30,45 @@ def test_cannot_create_signature_without_correct_base_task() -> None:
     with pytest.raises(InvalidTaskBase):
         job = cast(Job, JobFactory())
         job.s()
+
+
+def test_batch_apply(django_assert_num_queries) -> None:
+    jobs = [cast(ValueJob, ValueJobFactory(value=i)) for i in range(5)]
+    canvas = group([job.s() for job in jobs])
+    handler = Mock()
+    tasks_queued.connect(handler, sender=ValueJob)
+    try:
+        # one query to load the records and one to store the results
+        with django_assert_num_queries(2):
+            with batch_apply(canvas):
+                result = canvas.apply_async()
+    finally:
+        tasks_queued.disconnect(handler, sender=ValueJob)
+
+    assert handler.call_count == 1
+    assert ValueJob.get_queue_size() == 5
+    for job, task_result in zip(jobs, result.results):
+        job.refresh_from_db()
+        assert job.curr_async_result_id == task_result.id
+        assert job.datetime_queued
+
+
+def test_batch_apply_version() -> None:
+    job = cast(ValueJob, ValueJobFactory())
+    sig = job.s()
+    job.save()
+    with pytest.raises(ValueJob.DoesNotExist):
+        with batch_apply(sig):
+            sig.apply_async()
+
+
+def test_iter_signatures(django_assert_num_queries) -> None:
+    jobs = [cast(AddToJob, AddToJobFactory()) for __ in range(5)]
+    with django_assert_num_queries(1):
+        chunks = list(AddToJob.iter_signatures(AddToJob.objects.order_by("pk"), chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [sig for chunk in chunks for sig in chunk] == [job.s() for job in jobs]
+    assert len(next(AddToJob.iter_signatures())) == 5
+
+    with pytest.raises(InvalidTaskBase):
+        next(Job.iter_signatures())
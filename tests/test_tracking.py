@@ -1,11 +1,16 @@
 """Tests for task tracking and graceful termination functionality."""
 
+import time
+from datetime import timedelta
+from unittest import mock
 from uuid import uuid4
 
+import pytest
 from demo.factories import JobFactory
 from demo.models import Job
+from demo.tasks import echo
 
-from django_celery_boost.models import CELERY_BOOST_TRACKING_KEY_PREFIX
+from django_celery_boost.models import CELERY_BOOST_TRACKING_KEY_PREFIX, InvalidTaskBase, ProgressReporter
 
 
 def test_tracking_no_task_id(db):
@@ -175,3 +180,159 @@ def test_get_current_with_mock(db):
     with patch("celery.current_task", mock_task):
         result = Job.get_current()
         assert result == job
+
+
+def test_fan_out(db):
+    """Chunks share the progress and the cancellation flag of the record."""
+    job: Job = JobFactory()
+    job.queue()
+    task_id = job.curr_async_result_id
+
+    canvas = job.fan_out(list(range(10)), chunks=3)
+    assert len(canvas.tasks) == 3
+    assert canvas.apply().get() == [4, 4, 2]
+    assert job.get_tracking_info("total", "progress") == {"total": "10", "progress": "10"}
+    job.refresh_from_db()
+    assert job.curr_async_result_id == task_id
+
+    assert job.fan_out([1, 2], chunks=2, callback=echo.s()).apply().get() == [1, 1]
+    assert job.progress == "2/2"
+
+    job.request_cancellation()
+    assert job.fan_out(list(range(10)), chunks=3).apply().get() == [0, 0, 0]
+
+
+def test_fan_out_invalid_task(db):
+    """Chunks must be processed by TaskRunFromSignature tasks."""
+    job: Job = JobFactory()
+    with pytest.raises(InvalidTaskBase):
+        job.fan_out([1], chunks=1, task_name="demo.tasks.echo")
+
+
+@pytest.mark.parametrize("chunks", [0, -1])
+def test_fan_out_invalid_chunks(db, chunks):
+    job: Job = JobFactory()
+    with pytest.raises(ValueError):
+        job.fan_out([1], chunks=chunks)
+
+
+def test_progress_reporter(db):
+    """Updates are buffered and written in one round-trip per flush."""
+    job: Job = JobFactory()
+    job.queue()
+
+    pool = Job.celery_app.pool
+    with mock.patch.object(pool, "acquire", wraps=pool.acquire) as acquire:
+        with job.progress_reporter(interval=3600, max_updates=50) as reporter:
+            reporter.set_total(100)
+            for __ in range(100):
+                reporter.incr_progress()
+            assert acquire.call_count == 2
+    assert acquire.call_count == 3
+    assert job.progress == "100/100"
+
+    with job.progress_reporter(interval=0) as reporter:
+        reporter.set_progress(1)
+        assert job.progress == "1/100"
+        reporter.set("note", "done")
+    assert job.get_tracking_info("note") == {"note": "done"}
+
+
+def test_progress_reporter_flush_on_error(db):
+    job: Job = JobFactory()
+    job.queue()
+    with pytest.raises(ValueError):
+        with job.progress_reporter(interval=3600) as reporter:
+            reporter.set_progress(5)
+            raise ValueError()
+    assert job.get_tracking_info("progress") == {"progress": "5"}
+
+
+def test_progress_reporter_flush_error(db):
+    job: Job = JobFactory()
+    job.queue()
+    with mock.patch.object(ProgressReporter, "flush", side_effect=ConnectionError()):
+        with pytest.raises(ValueError):
+            with job.progress_reporter(interval=3600):
+                raise ValueError()
+        with pytest.raises(ConnectionError):
+            with job.progress_reporter(interval=3600):
+                pass
+
+
+def test_progress_stats(db):
+    """Progress updates sample the rate in the tracking hash."""
+    job: Job = JobFactory()
+    assert job.get_progress_stats() is None
+    job.queue()
+    job.set_total(100)
+    assert job.get_progress_stats() == (None, "100", None, None, None)
+
+    with mock.patch.object(Job, "celery_progress_sample_interval", 0):
+        job.set_progress(0)
+        assert job.progress_rate is None
+        assert job.progress_elapsed >= timedelta(0)
+        time.sleep(0.01)
+        assert job.incr_progress(10) == 10
+        with job.progress_reporter() as reporter:
+            time.sleep(0.01)
+            reporter.incr_progress(10)
+
+    stats = job.get_progress_stats()
+    assert stats.progress == "20"
+    assert 0 < stats.rate < 2000
+    assert stats.eta == timedelta(seconds=80 / stats.rate)
+    assert job.progress_eta == stats.eta
+    assert job.progress_rate == stats.rate
+    # the sampling state is kept out of the tracking data
+    assert set(job.tracking_info) == {"total", "progress", "rate"}
+
+    # samples closer than celery_progress_sample_interval do not update the rate
+    job.incr_progress()
+    assert job.progress_rate == stats.rate
+
+
+def test_cancellation_token(db):
+    """The flag is read at most every interval seconds."""
+    job: Job = JobFactory()
+    job.queue()
+
+    with mock.patch.object(Job, "is_termination_requested", new_callable=mock.PropertyMock) as requested:
+        requested.return_value = False
+        with job.cancellation_token(interval=3600) as cancelled:
+            for __ in range(100):
+                assert not cancelled
+            assert requested.call_count == 1
+            requested.return_value = True
+            assert not cancelled
+            assert cancelled.refresh()
+            assert cancelled
+
+    with job.cancellation_token(interval=0) as cancelled:
+        assert not cancelled
+        Job.objects.get(pk=job.pk).request_cancellation()
+        assert cancelled.cancelled
+
+
+def test_cancellation_token_push(db):
+    """Cancellation requests are pushed to the token."""
+    job: Job = JobFactory()
+    job.queue()
+
+    with job.cancellation_token(interval=0.05, push=True) as cancelled:
+        with mock.patch.object(Job, "is_termination_requested", new_callable=mock.PropertyMock) as requested:
+            assert not cancelled
+            Job.objects.get(pk=job.pk).request_cancellation()
+            for __ in range(100):
+                if cancelled:
+                    break
+                time.sleep(0.02)
+            assert cancelled
+        requested.assert_not_called()
+        thread = cancelled._thread
+    assert cancelled._thread is None
+    assert not thread.is_alive()
+
+    # requests sent before the token is created
+    with job.cancellation_token(push=True) as cancelled:
+        assert cancelled